@@ -127,6 +127,13 @@ FLASK_HOST: str = "0.0.0.0"
 FLASK_PORT: int = int(os.getenv("PORT", "5000"))
 FLASK_DEBUG: bool = os.getenv("FLASK_DEBUG", "False").lower() == "true"
 
+# Max cached responses per reconciliation endpoint (identical payloads skip the pipeline)
+RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+
+# Worker processes for clinical text extraction (0 = extract in the request thread).
+# Each process loads its own NLP model.
+EXTRACTION_WORKERS: int = int(os.getenv("EXTRACTION_WORKERS", "0"))
+
 # ============================================================================
 # Validation
 # ============================================================================
@@ -0,0 +1,74 @@
+"""
+Request Coalescer
+Collapses concurrent identical reconciliation requests into a single pipeline run.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional
+import threading
+
+
+class _InflightCall:
+    """Result slot shared by every caller waiting on the same key."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """
+    Runs at most one call per key at a time; concurrent callers with the
+    same key wait for and share the leader's result.
+
+    Uses threading primitives, which gevent's monkey-patching makes
+    greenlet-aware, so it works under both the threaded dev server and
+    gevent workers.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: Max seconds a follower waits before running the call itself
+        """
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _InflightCall] = {}
+
+    def run(self, key: Hashable, func: Callable, *args) -> Any:
+        """
+        Return func(*args), sharing one execution among concurrent callers.
+
+        Args:
+            key: Identity of the call (equal keys must mean equal results)
+            func: Function to execute
+            *args: Positional arguments for func
+
+        Returns:
+            Result of func(*args); re-raises the leader's exception for followers
+        """
+        with self._lock:
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._inflight[key] = _InflightCall()
+
+        if not is_leader:
+            if not call.done.wait(self.timeout):
+                return func(*args)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
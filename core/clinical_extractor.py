@@ -33,35 +33,49 @@ class ClinicalExtractor:
         """
         logger.info(f"Initializing ClinicalExtractor with model: {model_name}")
         
-        self.use_spacy = False
-        self.nlp = None
+        self.nlp = self._get_nlp(model_name)
+        self.use_spacy = self.nlp is not None
         
+        logger.info("ClinicalExtractor initialized successfully")
+    
+    # Loaded medSpaCy pipelines by model name (None if unavailable), shared
+    # by every extractor in the process since each load costs seconds and
+    # hundreds of MB
+    _NLP_CACHE: Dict[str, object] = {}
+    
+    @classmethod
+    def _get_nlp(cls, model_name: str):
+        """Return the shared medSpaCy pipeline for a model, loading it once."""
+        if model_name in cls._NLP_CACHE:
+            return cls._NLP_CACHE[model_name]
+        
+        nlp = None
         try:
             # Try to load medSpaCy pipeline (includes spaCy + clinical components)
             import medspacy
-            self.nlp = medspacy.load(model_name=model_name)
+            nlp = medspacy.load(model_name=model_name)
             logger.info(f"Loaded medSpaCy pipeline with model: {model_name}")
-            logger.info(f"Pipeline components: {self.nlp.pipe_names}")
+            logger.info(f"Pipeline components: {nlp.pipe_names}")
             
             # Add medication patterns to target matcher
-            self._add_medication_patterns_medspacy()
-            
-            self.use_spacy = True
+            cls._add_medication_patterns_medspacy(nlp)
             
         except (ImportError, OSError) as e:
             logger.warning(f"medSpaCy not available: {e}")
             logger.warning("Falling back to regex-based extraction")
-            self.use_spacy = False
+            nlp = None
         
-        logger.info("ClinicalExtractor initialized successfully")
+        cls._NLP_CACHE[model_name] = nlp
+        return nlp
     
-    def _add_medication_patterns_medspacy(self):
+    @staticmethod
+    def _add_medication_patterns_medspacy(nlp):
         """Add medication entity patterns to medSpaCy target matcher."""
         try:
             from medspacy.ner import TargetRule
             
             # Get the target_matcher component
-            target_matcher = self.nlp.get_pipe("medspacy_target_matcher")
+            target_matcher = nlp.get_pipe("medspacy_target_matcher")
             
             # Common medication names (expand this list as needed)
             common_meds = [
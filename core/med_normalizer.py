@@ -4,6 +4,7 @@ Normalizes medication names using RxNorm/UMLS and standardizes attributes.
 """
 
 import re
+from functools import lru_cache
 from typing import Optional, Dict, List
 from models.med_event import MedicationEvent
 import logging
@@ -123,8 +124,27 @@ class MedicationNormalizer:
             "q12h": "every_12_hours",
         }
         
+        # Notes repeat the same drugs, routes and frequencies many times; the
+        # helpers are pure lookups, so memoize them per instance (wrapping the
+        # bound methods keeps self out of the cache keys)
+        for name in self._CACHED_HELPERS:
+            setattr(self, name, lru_cache(maxsize=4096)(getattr(self, name)))
+        
         logger.info("MedicationNormalizer initialized")
     
+    _CACHED_HELPERS = (
+        "_normalize_drug_name",
+        "_normalize_dose_unit",
+        "_normalize_route",
+        "_normalize_frequency",
+        "_get_rxnorm_cui",
+    )
+    
+    def clear_caches(self) -> None:
+        """Clear the memoized normalization lookups (e.g. between tests)."""
+        for name in self._CACHED_HELPERS:
+            getattr(self, name).cache_clear()
+    
     def normalize_medication(self, med_event: MedicationEvent) -> MedicationEvent:
         """
         Normalize a medication event.
@@ -3,20 +3,76 @@ Medication Reconciliation Pipeline
 Orchestrates the three-stage reconciliation process.
 """
 
-from typing import Dict, Tuple, List
+from typing import Dict, Iterator, Optional, Tuple, List
 from models.med_event import MedicationEvent, MedicationList
 from core.clinical_extractor import ClinicalExtractor
 from core.temporal_parser import TemporalParser
 from core.med_normalizer import MedicationNormalizer
 from core.reconciliation_engine import ReconciliationEngine
 from core.report_generator import ReportGenerator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import logging
 from datetime import datetime
+import config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_extraction_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the Stage 1 process pool, or None when extraction runs inline.
+    
+    Extraction is CPU-bound (spaCy/regex) and would otherwise hold the GIL
+    and stall every other greenlet in a gevent worker. Created on first use
+    so gunicorn's preloading master never forks with a live pool.
+    """
+    if config.EXTRACTION_WORKERS <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=config.EXTRACTION_WORKERS)
+
+
+@lru_cache(maxsize=1)
+def _get_worker_components() -> Tuple[ClinicalExtractor, TemporalParser]:
+    """Extractor and temporal parser owned by an extraction worker process."""
+    return ClinicalExtractor(), TemporalParser()
+
+
+def _extract_in_worker(text: str, list_source: str) -> List[MedicationEvent]:
+    """Pool entry point: Stage 1 extraction for one text (must stay module-level to pickle)."""
+    extractor, temporal_parser = _get_worker_components()
+    return _extract_with_temporal(extractor, temporal_parser, text, list_source)
+
+
+def _extract_with_temporal(
+    extractor: ClinicalExtractor,
+    temporal_parser: TemporalParser,
+    text: str,
+    list_source: str
+) -> List[MedicationEvent]:
+    """Extract medication events from text and attach temporal information."""
+    meds = extractor.extract_medications(text, list_source=list_source)
+    
+    # Extract all temporal expressions from text
+    temporal_info = temporal_parser.extract_temporal_info(text)
+    
+    # If we found temporal info, apply it to medications
+    if temporal_info['date_iso']:
+        for med in meds:
+            # Check if the medication's text snippet contains temporal info
+            med_temporal = temporal_parser.extract_temporal_info(
+                med.raw_text_snippet
+            )
+            
+            if med_temporal['date_iso']:
+                med.date_of_change_iso = med_temporal['date_iso']
+                med.temporal_expression = med_temporal['temporal_expression']
+    
+    return meds
+
+
 class MedRecPipeline:
     """
     End-to-end medication reconciliation pipeline.
@@ -67,6 +123,37 @@ class MedRecPipeline:
         Returns:
             Complete reconciliation result with report
         """
+        for _, result in self.run_stages(
+            prior_text,
+            current_text,
+            patient_id,
+            encounter_id,
+            prior_text_source,
+            current_text_source
+        ):
+            pass
+        return result
+    
+    def run_stages(
+        self,
+        prior_text: str,
+        current_text: str,
+        patient_id: str = None,
+        encounter_id: str = None,
+        prior_text_source: str = "Prior Medication List",
+        current_text_source: str = "Current Clinical Note"
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Run the pipeline, yielding after each stage so callers can stream.
+        
+        Yields, in order:
+            ("normalization", medication list as a dict)
+            ("reconciliation", reconciliation result)
+            ("complete", the full result returned by run_full_pipeline)
+        
+        Args:
+            Same as run_full_pipeline
+        """
         logger.info("=" * 80)
         logger.info("Starting Full Medication Reconciliation Pipeline")
         logger.info("=" * 80)
@@ -100,6 +187,8 @@ class MedRecPipeline:
             prior_text_source=prior_text_source,
             current_text_source=current_text_source
         )
+        medication_list = med_list.to_dict()
+        yield "normalization", medication_list
         
         # Stage 3: LLM-powered reconciliation
         logger.info("\n[STAGE 3] LLM-Powered Reconciliation")
@@ -115,7 +204,9 @@ class MedRecPipeline:
         logger.info(f"✓ Identified {reconciliation_result['summary']['addition_count']} additions")
         logger.info(f"✓ Identified {reconciliation_result['summary']['discontinuation_count']} discontinuations")
         logger.info(f"✓ Identified {reconciliation_result['summary']['ambiguity_count']} ambiguities")
-          # Generate report
+        yield "reconciliation", reconciliation_result
+        
+        # Generate report
         logger.info("\n[REPORT GENERATION]")
         logger.info("-" * 40)
         
@@ -127,7 +218,7 @@ class MedRecPipeline:
         
         # Compile final result
         final_result = {
-            "medication_list": med_list.dict(),
+            "medication_list": medication_list,
             "reconciliation": reconciliation_result,
             "report_markdown": markdown_report,
             "report_html": html_report,
@@ -142,7 +233,7 @@ class MedRecPipeline:
         logger.info("Pipeline Complete!")
         logger.info("=" * 80 + "\n")
         
-        return final_result
+        yield "complete", final_result
     
     def _stage1_extract(
         self,
@@ -159,46 +250,22 @@ class MedRecPipeline:
         Returns:
             Tuple of (prior_events, current_events)
         """
-        # Extract medications from both texts
-        prior_meds = self.clinical_extractor.extract_medications(
-            prior_text,
-            list_source="prior"
+        pool = _get_extraction_pool()
+        if pool is not None:
+            # Extract both texts in parallel worker processes
+            prior_future = pool.submit(_extract_in_worker, prior_text, "prior")
+            current_future = pool.submit(_extract_in_worker, current_text, "current")
+            return prior_future.result(), current_future.result()
+        
+        prior_meds = _extract_with_temporal(
+            self.clinical_extractor, self.temporal_parser, prior_text, "prior"
         )
-        
-        current_meds = self.clinical_extractor.extract_medications(
-            current_text,
-            list_source="current"
+        current_meds = _extract_with_temporal(
+            self.clinical_extractor, self.temporal_parser, current_text, "current"
         )
         
-        # Enhance with temporal information
-        prior_meds = self._add_temporal_info(prior_meds, prior_text)
-        current_meds = self._add_temporal_info(current_meds, current_text)
-        
         return prior_meds, current_meds
     
-    def _add_temporal_info(
-        self,
-        meds: List[MedicationEvent],
-        full_text: str
-    ) -> List[MedicationEvent]:
-        """Add temporal information to medication events."""
-        # Extract all temporal expressions from text
-        temporal_info = self.temporal_parser.extract_temporal_info(full_text)
-        
-        # If we found temporal info, apply it to medications
-        if temporal_info['date_iso']:
-            for med in meds:
-                # Check if the medication's text snippet contains temporal info
-                med_temporal = self.temporal_parser.extract_temporal_info(
-                    med.raw_text_snippet
-                )
-                
-                if med_temporal['date_iso']:
-                    med.date_of_change_iso = med_temporal['date_iso']
-                    med.temporal_expression = med_temporal['temporal_expression']
-        
-        return meds
-    
     def _stage2_normalize(
         self,
         prior_meds: List[MedicationEvent],
@@ -5,11 +5,33 @@ Supports both simple and comprehensive reconciliation prompts.
 """
 
 import os
+from functools import lru_cache
 from typing import Dict, List, Optional
 from openai import OpenAI, AzureOpenAI
 import config
 
 
+@lru_cache(maxsize=1)
+def _get_http_client():
+    """
+    Return the process-wide httpx client shared by every ModelEngine.
+    
+    One keep-alive pool per process means LLM calls from the simple and
+    clinical reconcilers (and from concurrent greenlets) reuse warm TLS
+    connections instead of each engine handshaking on its own pool.
+    Created without proxy settings to avoid compatibility issues.
+    """
+    import httpx
+    return httpx.Client(
+        timeout=float(config.LLM_TIMEOUT),
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=100,
+            max_connections=200
+        )
+    )
+
+
 class ModelEngine:
     """Manages LLM API calls and prompt engineering."""
 
@@ -18,12 +40,7 @@ class ModelEngine:
         self.client = None
         if not self.skip_llm:
             # Initialize OpenAI client - support both Azure and standard OpenAI
-            # Create httpx client without proxy settings to avoid compatibility issues
-            import httpx
-            http_client = httpx.Client(
-                timeout=60.0,
-                follow_redirects=True
-            )
+            http_client = _get_http_client()
             
             if config.USE_AZURE and config.AZURE_ENDPOINT:
                 # Azure OpenAI configuration
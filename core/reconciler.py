@@ -10,6 +10,13 @@ from tools.safety_checks import SafetyValidator
 from tools.ledger import ReconciliationLedger
 
 
+# LLM output used when both lists are the same (see _lists_identical)
+_IDENTICAL_LISTS_OUTPUT = (
+    "Both medication lists are identical. No additions, discontinuations, "
+    "or changes were found; all medications are continued without change."
+)
+
+
 class MedicationReconciler:
     """
     Main orchestrator for medication reconciliation process.
@@ -68,7 +75,10 @@ class MedicationReconciler:
         safety_issues = self.safety_validator.validate_all(all_meds, labs)
         
         # Step 4: Call LLM for reconciliation reasoning
-        if mode == "simple":
+        if mode == "simple" and self._lists_identical(baseline_meds, reference_meds):
+            # Nothing to reconcile; the deterministic checks above still ran
+            llm_output = _IDENTICAL_LISTS_OUTPUT
+        elif mode == "simple":
             llm_output = self.model_engine.reconcile_simple(
                 baseline_meds,
                 reference_meds,
@@ -111,6 +121,16 @@ class MedicationReconciler:
         
         return result
     
+    @staticmethod
+    def _lists_identical(baseline_meds: List[str], reference_meds: List[str]) -> bool:
+        """True if both raw lists match entry-for-entry, ignoring case and padding."""
+        if len(baseline_meds) != len(reference_meds):
+            return False
+        return all(
+            b.strip().lower() == r.strip().lower()
+            for b, r in zip(baseline_meds, reference_meds)
+        )
+    
     def _build_ledger(
         self,
         baseline_meds: List[Medication],
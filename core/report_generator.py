@@ -3,14 +3,140 @@ Report Generator
 Generates human-readable reconciliation reports in markdown format.
 """
 
-from typing import Dict, List
+from typing import Callable, Dict, List, Tuple
 from datetime import datetime
 import logging
+import operator
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Per-row field defaults and access for matched/discrepant medications in the HTML report
+_MATCH_DEFAULTS = {
+    'drug_name': 'Unknown',
+    'prior_dose': 'N/A',
+    'prior_frequency': '',
+    'current_dose': 'N/A',
+    'current_frequency': '',
+    'notes': '',
+}
+_MATCH_GET = operator.itemgetter(
+    'drug_name', 'prior_dose', 'prior_frequency',
+    'current_dose', 'current_frequency', 'notes'
+)
+
+# f-string body for a matched-medication row; compiled by _compile_row
+_MATCH_HTML_TPL = """
+                <div class="med-item">
+                    <div class="med-name">{drug_name}</div>
+                    <div class="med-details">
+                        <span><strong>Prior:</strong> {prior_dose} {prior_frequency}</span>
+                        <span><strong>Current:</strong> {current_dose} {current_frequency}</span>
+                    </div>
+                    {f'<div class="med-notes">{notes}</div>' if notes else ''}
+                </div>
+                """
+
+# Static shells of the HTML report, filled with str.format
+_HTML_PREAMBLE = """
+        <div class="html-report">
+            <div class="report-header">
+                <h2>🏥 Medication Reconciliation Report</h2>
+                <p class="timestamp">Generated: {ts}</p>
+            </div>
+            
+"""
+
+_SUMMARY_KEYS = (
+    'total_prior_meds', 'total_current_meds', 'matched_count', 'discrepancy_count',
+    'addition_count', 'discontinuation_count', 'ambiguity_count'
+)
+
+_HTML_SUMMARY_GRID = """            <div class="summary-section">
+                <h3>📊 Executive Summary</h3>
+                <div class="summary-grid">
+                    <div class="summary-stat">
+                        <span class="stat-label">Prior Medications:</span>
+                        <span class="stat-value">{total_prior_meds}</span>
+                    </div>
+                    <div class="summary-stat">
+                        <span class="stat-label">Current Medications:</span>
+                        <span class="stat-value">{total_current_meds}</span>
+                    </div>
+                    <div class="summary-stat">
+                        <span class="stat-label">Matched:</span>
+                        <span class="stat-value success">{matched_count}</span>
+                    </div>
+                    <div class="summary-stat">
+                        <span class="stat-label">Discrepancies:</span>
+                        <span class="stat-value warning">{discrepancy_count}</span>
+                    </div>
+                    <div class="summary-stat">
+                        <span class="stat-label">Additions:</span>
+                        <span class="stat-value info">{addition_count}</span>
+                    </div>
+                    <div class="summary-stat">
+                        <span class="stat-label">Discontinuations:</span>
+                        <span class="stat-value danger">{discontinuation_count}</span>
+                    </div>
+                    <div class="summary-stat">
+                        <span class="stat-label">Ambiguities:</span>
+                        <span class="stat-value danger">{ambiguity_count}</span>
+                    </div>
+                </div>
+                <div class="attention-level">
+                    <strong>Review Priority:</strong> {attention_level}
+                </div>
+                {clinical_notes}
+            </div>
+        """
+
+_HTML_EPILOGUE = """
+            <div class="report-footer">
+                <p><strong>System:</strong> VAMedRec v1.0 - VA Medication Reconciliation</p>
+                <p><strong>⚠️ Important:</strong> This is an automated analysis. All findings must be reviewed by a qualified healthcare professional.</p>
+            </div>
+        </div>
+        """
+
+_ROW_RENDERERS: Dict[Tuple[Tuple[Tuple[str, str], ...], str], Callable[[Dict], str]] = {}
+
+
+def _compile_row(keys: Tuple[str, ...], template: str, defaults: Dict[str, str]) -> Callable[[Dict], str]:
+    """
+    Compile a row template into a specialized render function.
+    
+    The generated function binds each key to a local (falling back to its
+    default) and returns the template evaluated as an f-string, so rendering
+    a row is a handful of dict lookups plus one string build.
+    
+    Args:
+        keys: Row keys referenced by the template (must be identifiers)
+        template: f-string body; may only reference names in ``keys``
+        defaults: Default value per key when absent from the row
+    
+    Returns:
+        Function mapping a row dict to its rendered string
+    """
+    # The defaults are compiled into the function, so they are part of its identity
+    bound = tuple((k, defaults.get(k, '')) for k in keys)
+    cache_key = (bound, template)
+    renderer = _ROW_RENDERERS.get(cache_key)
+    if renderer is None:
+        lines = ["def _render(d, _get=dict.get):"]
+        lines.extend(f"    {k} = _get(d, {k!r}, {v!r})" for k, v in bound)
+        lines.append(f'    return f"""{template}"""')
+        namespace = {}
+        exec(compile("\n".join(lines), "<report row>", "exec"), namespace)
+        renderer = _ROW_RENDERERS[cache_key] = namespace["_render"]
+    return renderer
+
+
+def _now_str() -> str:
+    """Current local time as 'YYYY-MM-DD HH:MM:SS'."""
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+
 class ReportGenerator:
     """
     Generates actionable reconciliation reports.
@@ -24,6 +150,12 @@ class ReportGenerator:
     
     def __init__(self):
         logger.info("Initializing ReportGenerator")
+        self._render_match = _compile_row(
+            ('drug_name', 'prior_dose', 'prior_frequency',
+             'current_dose', 'current_frequency', 'notes'),
+            _MATCH_HTML_TPL,
+            _MATCH_DEFAULTS
+        )
     
     def generate_report(self, reconciliation_result: Dict) -> str:
         """
@@ -35,12 +167,13 @@ class ReportGenerator:
         Returns:
             Markdown-formatted report string
         """
-        logger.info("Generating reconciliation report")
+        logger.debug("Generating reconciliation report")
         
+        timestamp = _now_str()
         report_sections = []
         
         # Header
-        report_sections.append(self._generate_header(reconciliation_result))
+        report_sections.append(self._generate_header(reconciliation_result, timestamp=timestamp))
         
         # Clinical Narrative (NEW - highest priority)
         report_sections.append(self._generate_narrative_section(reconciliation_result))
@@ -72,7 +205,7 @@ class ReportGenerator:
         # Combine all sections
         report = "\n\n".join(report_sections)
         
-        logger.info("Report generated successfully")
+        logger.debug("Report generated successfully")
         return report
     
     def generate_html_report(self, reconciliation_result: Dict) -> str:
@@ -85,7 +218,7 @@ class ReportGenerator:
         Returns:
             HTML-formatted report string
         """
-        logger.info("Generating HTML reconciliation report")
+        logger.debug("Generating HTML reconciliation report")
         
         summary = reconciliation_result.get('summary', {})
         matches = reconciliation_result.get('matches', [])
@@ -93,8 +226,11 @@ class ReportGenerator:
         additions = reconciliation_result.get('additions', [])
         discontinuations = reconciliation_result.get('discontinuations', [])
         ambiguities = reconciliation_result.get('ambiguities', [])
+        n_matches, n_disc, n_add, n_dcn, n_amb = map(
+            len, (matches, discrepancies, additions, discontinuations, ambiguities)
+        )
         
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = _now_str()
         
         # Calculate attention score
         attention_score = (summary.get('discrepancy_count', 0) * 3) + \
@@ -108,51 +244,16 @@ class ReportGenerator:
         else:
             attention_level = '<span style="color: #388e3c; font-weight: bold;">🟢 LOW - Standard Review</span>'
         
-        html = f"""
-        <div class="html-report">
-            <div class="report-header">
-                <h2>🏥 Medication Reconciliation Report</h2>
-                <p class="timestamp">Generated: {timestamp}</p>
-            </div>
-            
-            <div class="summary-section">
-                <h3>📊 Executive Summary</h3>
-                <div class="summary-grid">
-                    <div class="summary-stat">
-                        <span class="stat-label">Prior Medications:</span>
-                        <span class="stat-value">{summary.get('total_prior_meds', 0)}</span>
-                    </div>
-                    <div class="summary-stat">
-                        <span class="stat-label">Current Medications:</span>
-                        <span class="stat-value">{summary.get('total_current_meds', 0)}</span>
-                    </div>
-                    <div class="summary-stat">
-                        <span class="stat-label">Matched:</span>
-                        <span class="stat-value success">{summary.get('matched_count', 0)}</span>
-                    </div>
-                    <div class="summary-stat">
-                        <span class="stat-label">Discrepancies:</span>
-                        <span class="stat-value warning">{summary.get('discrepancy_count', 0)}</span>
-                    </div>
-                    <div class="summary-stat">
-                        <span class="stat-label">Additions:</span>
-                        <span class="stat-value info">{summary.get('addition_count', 0)}</span>
-                    </div>
-                    <div class="summary-stat">
-                        <span class="stat-label">Discontinuations:</span>
-                        <span class="stat-value danger">{summary.get('discontinuation_count', 0)}</span>
-                    </div>
-                    <div class="summary-stat">
-                        <span class="stat-label">Ambiguities:</span>
-                        <span class="stat-value danger">{summary.get('ambiguity_count', 0)}</span>
-                    </div>
-                </div>
-                <div class="attention-level">
-                    <strong>Review Priority:</strong> {attention_level}
-                </div>
-                {f'<div class="clinical-notes"><strong>Clinical Notes:</strong> {summary.get("clinical_notes", "")}</div>' if summary.get("clinical_notes") else ''}
-            </div>
-        """
+        summary_view = {key: summary.get(key, 0) for key in _SUMMARY_KEYS}
+        summary_view['attention_level'] = attention_level
+        clinical_notes = summary.get("clinical_notes")
+        summary_view['clinical_notes'] = (
+            f'<div class="clinical-notes"><strong>Clinical Notes:</strong> {clinical_notes}</div>'
+            if clinical_notes else ''
+        )
+        
+        html = _HTML_PREAMBLE.format(ts=timestamp)
+        html += _HTML_SUMMARY_GRID.format_map(summary_view)
         
         # Clinical Narrative Section
         narrative = reconciliation_result.get('narrative', {})
@@ -217,28 +318,20 @@ class ReportGenerator:
             html += "</div>"
         
         # Matched Medications
-        if matches:
+        if n_matches:
             html += """
             <div class="report-section success-section">
                 <h3>✅ Matched Medications</h3>
                 <p class="section-desc">These medications appear in both lists without significant changes.</p>
                 <div class="med-list">
             """
+            render_match = self._render_match
             for match in matches:
-                html += f"""
-                <div class="med-item">
-                    <div class="med-name">{match.get('drug_name', 'Unknown')}</div>
-                    <div class="med-details">
-                        <span><strong>Prior:</strong> {match.get('prior_dose', 'N/A')} {match.get('prior_frequency', '')}</span>
-                        <span><strong>Current:</strong> {match.get('current_dose', 'N/A')} {match.get('current_frequency', '')}</span>
-                    </div>
-                    {f'<div class="med-notes">{match.get("notes", "")}</div>' if match.get('notes') else ''}
-                </div>
-                """
+                html += render_match(match)
             html += "</div></div>"
         
         # Discrepancies
-        if discrepancies:
+        if n_disc:
             html += """
             <div class="report-section warning-section">
                 <h3>⚠️ Discrepancies - REVIEW REQUIRED</h3>
@@ -246,22 +339,23 @@ class ReportGenerator:
                 <div class="med-list">
             """
             for disc in discrepancies:
+                drug, prior_dose, prior_freq, cur_dose, cur_freq, notes = _MATCH_GET({**_MATCH_DEFAULTS, **disc})
                 html += f"""
                 <div class="med-item highlight-warning">
-                    <div class="med-name">{disc.get('drug_name', 'Unknown')}</div>
+                    <div class="med-name">{drug}</div>
                     <div class="med-details">
-                        <span><strong>Prior:</strong> {disc.get('prior_dose', 'N/A')} {disc.get('prior_frequency', '')}</span>
-                        <span><strong>Current:</strong> {disc.get('current_dose', 'N/A')} {disc.get('current_frequency', '')}</span>
+                        <span><strong>Prior:</strong> {prior_dose} {prior_freq}</span>
+                        <span><strong>Current:</strong> {cur_dose} {cur_freq}</span>
                     </div>
                     <div class="discrepancy-type"><strong>Type:</strong> {disc.get('discrepancy_type', 'Unknown')}</div>
-                    {f'<div class="med-notes"><strong>Notes:</strong> {disc.get("notes", "")}</div>' if disc.get('notes') else ''}
+                    {f'<div class="med-notes"><strong>Notes:</strong> {notes}</div>' if notes else ''}
                     <div class="action-required">⚠️ ACTION: Verify with prescriber</div>
                 </div>
                 """
             html += "</div></div>"
         
         # Additions
-        if additions:
+        if n_add:
             html += """
             <div class="report-section info-section">
                 <h3>➕ New Medications</h3>
@@ -282,7 +376,7 @@ class ReportGenerator:
             html += "</div></div>"
         
         # Discontinuations
-        if discontinuations:
+        if n_dcn:
             html += """
             <div class="report-section danger-section">
                 <h3>🛑 Discontinued Medications</h3>
@@ -302,7 +396,7 @@ class ReportGenerator:
             html += "</div></div>"
         
         # Ambiguities
-        if ambiguities:
+        if n_amb:
             html += """
             <div class="report-section danger-section">
                 <h3>❓ Ambiguities - URGENT REVIEW</h3>
@@ -324,14 +418,14 @@ class ReportGenerator:
         
         # Action Items
         action_items = []
-        if discrepancies:
-            action_items.append(f"• Verify {len(discrepancies)} dose/frequency discrepancies with prescriber")
-        if ambiguities:
-            action_items.append(f"• Clarify {len(ambiguities)} ambiguous medication entries URGENTLY")
-        if discontinuations:
-            action_items.append(f"• Confirm {len(discontinuations)} medication discontinuations")
-        if additions:
-            action_items.append(f"• Document {len(additions)} new medication additions")
+        if n_disc:
+            action_items.append(f"• Verify {n_disc} dose/frequency discrepancies with prescriber")
+        if n_amb:
+            action_items.append(f"• Clarify {n_amb} ambiguous medication entries URGENTLY")
+        if n_dcn:
+            action_items.append(f"• Confirm {n_dcn} medication discontinuations")
+        if n_add:
+            action_items.append(f"• Document {n_add} new medication additions")
         
         if action_items:
             html += """
@@ -343,20 +437,15 @@ class ReportGenerator:
                 html += f"<li>{item}</li>"
             html += "</ul></div>"
         
-        html += """
-            <div class="report-footer">
-                <p><strong>System:</strong> VAMedRec v1.0 - VA Medication Reconciliation</p>
-                <p><strong>⚠️ Important:</strong> This is an automated analysis. All findings must be reviewed by a qualified healthcare professional.</p>
-            </div>
-        </div>
-        """
+        html += _HTML_EPILOGUE
         
-        logger.info("HTML report generated successfully")
+        logger.debug("HTML report generated successfully")
         return html
     
-    def _generate_header(self, result: Dict) -> str:
+    def _generate_header(self, result: Dict, *, timestamp: str = None) -> str:
         """Generate report header."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if timestamp is None:
+            timestamp = _now_str()
         
         return f"""# 🏥 VAMedRec - Medication Reconciliation Report
 
@@ -3,15 +3,88 @@ Temporal Parser (Stage 1 Enhancement)
 Extracts and normalizes temporal expressions from clinical text using dateparser and Duckling.
 """
 
-import dateparser
+from dateparser.date import DateDataParser
 import re
-from typing import Optional, Dict, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
+from types import MappingProxyType
 import logging
 
-logging.basicConfig(level=logging.INFO)
+try:
+    # Installed with dateparser; supports atomic groups and possessive quantifiers
+    import regex as _regex
+except ImportError:
+    # stdlib re supports the same syntax from Python 3.11
+    _regex = re
+
 logger = logging.getLogger(__name__)
 
+# Days per fixed-length unit for "N <unit>s ago" expressions; months and
+# years are calendar units and go through relativedelta instead
+_UNIT_DAYS = {'day': 1, 'week': 7}
+
+_MONTH_NAMES = (
+    'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december'
+)
+
+# Month number by full name or common abbreviation ("jan", "sept")
+_MONTHS = {name: num for num, name in enumerate(_MONTH_NAMES, 1)}
+_MONTHS.update({name[:3]: num for num, name in enumerate(_MONTH_NAMES, 1)})
+_MONTHS['sept'] = 9
+
+# Joins texts for batch extraction. NUL is not whitespace, a word character
+# or punctuation any pattern uses, so no match can span two texts
+_BATCH_SEP = '\x00'
+
+# Base dateparser settings (read-only); RELATIVE_BASE is supplied per parse
+DATEPARSER_SETTINGS = MappingProxyType({
+    'PREFER_DATES_FROM': 'past',  # Clinical notes often reference past events
+    'RETURN_AS_TIMEZONE_AWARE': False
+})
+
+
+@lru_cache(maxsize=32)
+def _get_date_parser(reference_date_iso: str) -> DateDataParser:
+    """
+    Return a dateparser parser anchored at the given reference day.
+    
+    dateparser.parse builds a new DateDataParser whenever settings are
+    passed; sharing one per reference day keeps its language detection
+    and internal caches warm across calls.
+    """
+    settings = dict(DATEPARSER_SETTINGS, RELATIVE_BASE=datetime.fromisoformat(reference_date_iso))
+    return DateDataParser(settings=settings)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_string: str, reference_date_iso: str) -> Optional[str]:
+    """
+    Parse a date string with dateparser and return ISO format (memoized).
+    
+    Results never depend on shared mutable state. Relative expressions
+    resolve against the start of the reference day, which keeps the cache
+    key at day granularity.
+    
+    Args:
+        date_string: Date string to parse
+        reference_date_iso: Reference day as YYYY-MM-DD
+    
+    Returns:
+        ISO 8601 formatted date (YYYY-MM-DD) or None
+    """
+    data = _get_date_parser(reference_date_iso).get_date_data(date_string)
+    parsed = data['date_obj'] if data else None
+    
+    if parsed:
+        return parsed.strftime('%Y-%m-%d')
+    
+    return None
+
 
 class TemporalParser:
     """
@@ -23,33 +96,56 @@ class TemporalParser:
     - Duration ("for 2 months", "since June")
     """
     
+    # Temporal type for each named pattern group
+    _TYPE_BY_GROUP = {
+        'rel_ago': 'relative',
+        'last_next': 'relative',
+        'since': 'relative',
+        'started': 'absolute',
+        'md_date': 'absolute',
+        'month_name': 'absolute',
+        'duration': 'duration',
+    }
+    
     def __init__(self):
-        logger.info("Initializing TemporalParser")
+        logger.debug("Initializing TemporalParser")
         
         # Configure dateparser settings
-        self.dateparser_settings = {
-            'PREFER_DATES_FROM': 'past',  # Clinical notes often reference past events
-            'RELATIVE_BASE': datetime.now(),
-            'RETURN_AS_TIMEZONE_AWARE': False
-        }
+        # RELATIVE_BASE is never stored here: it is resolved per call so
+        # relative dates track request time; the view is read-only
+        self.dateparser_settings = DATEPARSER_SETTINGS
         
-        # Common temporal patterns in clinical text
+        # Common temporal patterns in clinical text, keyed by group name.
+        # Atomic groups and possessive quantifiers are only used where the
+        # next token cannot match what they would give back, so they change
+        # no matches and only cut backtracking on failing tails
         self.temporal_patterns = [
             # Relative time expressions
-            r'\b(\d+)\s+(day|week|month|year)s?\s+ago\b',
-            r'\b(last|this|next)\s+(week|month|year|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
-            r'\bsince\s+([A-Za-z]+\s+\d{1,2}(?:,\s+\d{4})?)\b',
-            r'\b(started|began|discontinued|stopped)\s+(?:on\s+)?([A-Za-z]+\s+\d{1,2})\b',
+            ('rel_ago', r'\b(?P<ago_n>\d++)\s++(?P<ago_unit>day|week|month|year)s?+\s++ago\b'),
+            ('last_next', r'\b(?>last|this|next)\s++(?>week|month|year|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b'),
+            ('since', r'\bsince\s++([A-Za-z]++\s++\d{1,2}+(?:,\s++\d{4}+)?)\b'),
+            ('started', r'\b(?>started|began|discontinued|stopped)\s++(?:on\s+)?([A-Za-z]++\s++\d{1,2}+)\b'),
             
             # Absolute dates
-            r'\b(\d{1,2})/(\d{1,2})/(\d{2,4})\b',
-            r'\b([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})\b',
+            ('md_date', r'\b(?P<md_month>\d{1,2}+)/(?P<md_day>\d{1,2}+)/(?P<md_year>\d{2,4}+)\b'),
+            ('month_name', r'\b(?P<mname>[A-Za-z]++)\s++(?P<mn_day>\d{1,2}+),?+\s++(?P<mn_year>\d{4}+)\b'),
             
             # Duration
-            r'\bfor\s+(\d+)\s+(day|week|month|year)s?\b',
+            ('duration', r'\bfor\s++(\d++)\s++(day|week|month|year)s?+\b'),
         ]
         
-        logger.info("TemporalParser initialized")
+        # Every pattern needs a digit except last/this/next, so texts without
+        # either can be rejected before the full alternation runs
+        self._prefilter = re.compile(r'\d|\b(?:last|this|next)\b', re.IGNORECASE)
+        
+        # Fuse into one alternation so each text is scanned once;
+        # m.lastgroup names the pattern that fired
+        self._combined = _regex.compile(
+            "|".join(f"(?P<{name}>{pattern})" for name, pattern in self.temporal_patterns),
+            _regex.IGNORECASE
+        )
+        
+        logger.debug("TemporalParser initialized")
     
     def extract_temporal_info(
         self,
@@ -69,8 +165,10 @@ class TemporalParser:
                 - temporal_expression: Original text expression
                 - temporal_type: "absolute", "relative", or "duration"
         """
-        if reference_date:
-            self.dateparser_settings['RELATIVE_BASE'] = reference_date
+        if not self._prefilter.search(text):
+            return {'date_iso': None, 'temporal_expression': None, 'temporal_type': None}
+        
+        reference_date = reference_date or datetime.now()
         
         result = {
             'date_iso': None,
@@ -78,37 +176,89 @@ class TemporalParser:
             'temporal_type': None
         }
         
-        # Try to find temporal expressions using patterns
-        for pattern in self.temporal_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                temporal_expr = match.group(0)
-                result['temporal_expression'] = temporal_expr
-                
-                # Parse the expression
-                parsed_date = dateparser.parse(
-                    temporal_expr,
-                    settings=self.dateparser_settings
-                )
-                
-                if parsed_date:
-                    result['date_iso'] = parsed_date.strftime('%Y-%m-%d')
-                    result['temporal_type'] = self._classify_temporal_type(temporal_expr)
-                    logger.debug(f"Parsed '{temporal_expr}' -> {result['date_iso']}")
-                    break
+        # Take the first temporal expression that parses; lastgroup identifies the type
+        for match, parsed_date in self._scan(text, reference_date, {}):
+            temporal_expr = match.group(0)
+            result['temporal_expression'] = temporal_expr
+            
+            if parsed_date:
+                result['date_iso'] = parsed_date
+                result['temporal_type'] = self._TYPE_BY_GROUP[match.lastgroup]
+                logger.debug(f"Parsed '{temporal_expr}' -> {result['date_iso']}")
+                break
         
         return result
     
-    def _classify_temporal_type(self, expression: str) -> str:
-        """Classify temporal expression type."""
-        expression_lower = expression.lower()
+    def _scan(self, text: str, reference_date: datetime, cache: Dict[str, Optional[str]]):
+        """
+        Yield (match, ISO date or None) for each temporal expression in text.
+        
+        The since/started branches swallow a whole "Month DD, YYYY" phrase,
+        so a match that does not resolve may hide one that would. Scanning
+        resumes one character past an unresolved match's start, and past
+        the end of a resolved one.
+        
+        Args:
+            text: Text to scan
+            reference_date: Anchor for relative expressions
+            cache: Resolved dates by lowercased expression, shared across calls
+        """
+        search = self._combined.search
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                return
+            
+            key = match.group(0).lower()
+            if key in cache:
+                parsed_date = cache[key]
+            else:
+                parsed_date = cache[key] = self._resolve_match(match, reference_date)
+            
+            yield match, parsed_date
+            pos = match.end() if parsed_date else match.start() + 1
+    
+    def _resolve_match(self, match, reference_date: datetime) -> Optional[str]:
+        """
+        Resolve a temporal match to an ISO date.
+        
+        Patterns with a fixed structure are computed directly from their
+        captured groups; everything else is handed to dateparser.
+        
+        Args:
+            match: Match from the combined temporal regex
+            reference_date: Anchor for relative expressions
         
-        if 'ago' in expression_lower or 'last' in expression_lower or 'since' in expression_lower:
-            return 'relative'
-        elif 'for' in expression_lower:
-            return 'duration'
-        else:
-            return 'absolute'
+        Returns:
+            ISO 8601 formatted date (YYYY-MM-DD) or None
+        """
+        group = match.lastgroup
+        try:
+            if group == 'rel_ago':
+                n = int(match.group('ago_n'))
+                unit = match.group('ago_unit').lower()
+                if unit in _UNIT_DAYS:
+                    delta = timedelta(days=n * _UNIT_DAYS[unit])
+                else:
+                    delta = relativedelta(**{unit + 's': n})
+                return (reference_date - delta).strftime('%Y-%m-%d')
+            if group == 'md_date' and len(match.group('md_year')) == 4:
+                return datetime(
+                    int(match.group('md_year')),
+                    int(match.group('md_month')),
+                    int(match.group('md_day'))
+                ).strftime('%Y-%m-%d')
+            if group == 'month_name':
+                month = _MONTHS.get(match.group('mname').lower())
+                if month:
+                    return datetime(
+                        int(match.group('mn_year')), month, int(match.group('mn_day'))
+                    ).strftime('%Y-%m-%d')
+        except ValueError:
+            pass  # Out-of-range day/month; let dateparser decide
+        
+        return _parse_date_cached(match.group(0), reference_date.date().isoformat())
     
     def parse_date(
         self,
@@ -125,18 +275,8 @@ class TemporalParser:
         Returns:
             ISO 8601 formatted date (YYYY-MM-DD) or None
         """
-        if reference_date:
-            settings = self.dateparser_settings.copy()
-            settings['RELATIVE_BASE'] = reference_date
-        else:
-            settings = self.dateparser_settings
-        
-        parsed = dateparser.parse(date_string, settings=settings)
-        
-        if parsed:
-            return parsed.strftime('%Y-%m-%d')
-        
-        return None
+        reference_date = reference_date or datetime.now()
+        return _parse_date_cached(date_string, reference_date.date().isoformat())
     
     def extract_all_dates(
         self,
@@ -153,27 +293,65 @@ class TemporalParser:
         Returns:
             List of dicts with temporal information
         """
+        if not self._prefilter.search(text):
+            return []
+        
+        reference_date = reference_date or datetime.now()
         dates = []
+        # Repeated expressions within one document resolve once
+        local_cache = {}
         
-        for pattern in self.temporal_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                temporal_expr = match.group(0)
-                
-                parsed_date = dateparser.parse(
-                    temporal_expr,
-                    settings=self.dateparser_settings
-                )
-                
-                if parsed_date:
-                    dates.append({
-                        'temporal_expression': temporal_expr,
-                        'date_iso': parsed_date.strftime('%Y-%m-%d'),
-                        'temporal_type': self._classify_temporal_type(temporal_expr),
-                        'span_start': match.start(),
-                        'span_end': match.end()
-                    })
+        for match, parsed_date in self._scan(text, reference_date, local_cache):
+            if parsed_date:
+                dates.append({
+                    'temporal_expression': match.group(0),
+                    'date_iso': parsed_date,
+                    'temporal_type': self._TYPE_BY_GROUP[match.lastgroup],
+                    'span_start': match.start(),
+                    'span_end': match.end()
+                })
         
         return dates
+    
+    def extract_all_dates_batch(
+        self,
+        texts: List[str],
+        reference_date: Optional[datetime] = None
+    ) -> List[List[Dict[str, str]]]:
+        """
+        Extract all date expressions from many texts in one regex pass.
+        
+        Args:
+            texts: Clinical texts
+            reference_date: Reference date for relative expressions
+        
+        Returns:
+            One list of temporal dicts per input text (spans are local to that text)
+        """
+        results = [[] for _ in texts]
+        joined = _BATCH_SEP.join(texts)
+        
+        if not self._prefilter.search(joined):
+            return results
+        
+        reference_date = reference_date or datetime.now()
+        # Start offset of each text within the joined string
+        offsets = list(accumulate((len(t) + len(_BATCH_SEP) for t in texts[:-1]), initial=0))
+        local_cache = {}
+        
+        for match, parsed_date in self._scan(joined, reference_date, local_cache):
+            if parsed_date:
+                idx = bisect_right(offsets, match.start()) - 1
+                base = offsets[idx]
+                results[idx].append({
+                    'temporal_expression': match.group(0),
+                    'date_iso': parsed_date,
+                    'temporal_type': self._TYPE_BY_GROUP[match.lastgroup],
+                    'span_start': match.start() - base,
+                    'span_end': match.end() - base
+                })
+        
+        return results
 
 
 # Example usage
@@ -0,0 +1,48 @@
+"""
+VAMedRec - Gunicorn Configuration
+Production WSGI server settings.
+
+Usage:
+    gunicorn -c gunicorn_conf.py main:app
+"""
+
+# Patch sockets/ssl before anything (including the preloaded app and its
+# httpx-based OpenAI client) imports them, so LLM round-trips yield to
+# other greenlets instead of blocking the worker
+from gevent import monkey
+monkey.patch_all()
+
+import multiprocessing
+import os
+import config
+
+bind = f"{config.FLASK_HOST}:{config.FLASK_PORT}"
+
+# Requests are dominated by LLM network wait, so concurrency comes from the
+# greenlets in each process (worker_connections), not the process count.
+# Each worker holds its own copy of the NLP model once refcount writes
+# touch its pages, so default to one per core; WEB_CONCURRENCY overrides.
+# Recycle workers periodically to bound memory growth
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "gevent"
+worker_connections = 2000
+max_requests = 500
+max_requests_jitter = 200
+timeout = config.LLM_TIMEOUT + 30  # Allow a full LLM call plus pipeline work
+
+# Load the app (and its NLP models) once in the master; workers share
+# the loaded pages copy-on-write instead of each re-initializing them
+preload_app = True
+
+
+def on_starting(server):
+    """Validate configuration before any worker is forked."""
+    config.validate_config()
+
+
+def when_ready(server):
+    """Load the reconcilers in the master so forked workers inherit them."""
+    if preload_app:
+        from main import _get_reconciler, _get_pipeline
+        _get_reconciler()
+        _get_pipeline()
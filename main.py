@@ -3,30 +3,71 @@ VAMedRec - Web API Entry Point
 Handles HTTP requests and responses for medication reconciliation service.
 """
 
-from flask import Flask, request, jsonify, render_template_string, render_template
-from typing import Dict
+from flask import Flask, request, jsonify, render_template, stream_with_context
+from flask.json.provider import JSONProvider
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Literal, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from werkzeug.exceptions import HTTPException
+import gzip
+import threading
+import orjson
 import config
-from core.reconciler import MedicationReconciler
-from core.med_rec_pipeline import MedRecPipeline
+from core.batch_coalescer import RequestCoalescer
+
+# orjson options shared by jsonify and the pre-serialized response bodies
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify skips the stdlib encoder."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response (no str round trip)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=_ORJSON_OPTIONS),
+            mimetype="application/json"
+        )
+
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
-# Initialize reconcilers
-reconciler = MedicationReconciler()
-clinical_pipeline = MedRecPipeline()
 
+# Reconcilers are created on first use so importing this module (and serving
+# /health) does not pull in spaCy/dateparser. Under gunicorn with
+# preload_app, gunicorn_conf.py warms them in the master before forking.
+@lru_cache(maxsize=1)
+def _get_reconciler():
+    """Return the shared MedicationReconciler."""
+    from core.reconciler import MedicationReconciler
+    return MedicationReconciler()
 
-@app.route('/', methods=['GET'])
-def home():
-    """Home page - interactive 2-stage pipeline UI."""
-    return render_template('reconciliation_form_2stage.html')
 
+@lru_cache(maxsize=1)
+def _get_pipeline():
+    """Return the shared clinical MedRecPipeline."""
+    from core.med_rec_pipeline import MedRecPipeline
+    return MedRecPipeline()
 
-@app.route('/docs', methods=['GET'])
-def api_documentation():
-    """API documentation page."""
-    html = """    <!DOCTYPE html>
+
+# Concurrent identical requests share one pipeline run instead of each
+# issuing its own LLM call while the response cache is still cold
+_coalescer = RequestCoalescer(timeout=config.LLM_TIMEOUT + 30)
+
+
+# Static API documentation page, encoded once at import
+_DOCS_HTML = """    <!DOCTYPE html>
     <html>
     <head>
         <title>VAMedRec - API Documentation</title>
@@ -211,7 +252,46 @@ def api_documentation():
     </body>
     </html>
     """
-    return render_template_string(html)
+_DOCS_BODY = _DOCS_HTML.encode("utf-8")
+_DOCS_GZ = gzip.compress(_DOCS_BODY, compresslevel=9)
+
+
+# Rendered static pages, keyed by template name, as (raw, gzipped) bodies.
+# The UI templates take no context, so each is rendered and compressed once
+# and served from memory afterwards.
+_TPL_CACHE: Dict[str, Tuple[bytes, bytes]] = {}
+
+
+def _html_response(raw: bytes, gz: bytes):
+    """Serve a static HTML body, gzipped when the client accepts it."""
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        resp = app.response_class(gz, mimetype="text/html")
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = app.response_class(raw, mimetype="text/html")
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
+def _render_static(template_name: str):
+    """Render a context-free template once and serve the cached bodies."""
+    bodies = _TPL_CACHE.get(template_name)
+    if bodies is None:
+        raw = render_template(template_name).encode("utf-8")
+        bodies = _TPL_CACHE[template_name] = (raw, gzip.compress(raw, compresslevel=9))
+    return _html_response(*bodies)
+
+
+@app.route('/', methods=['GET'])
+def home():
+    """Home page - interactive 2-stage pipeline UI."""
+    return _render_static('reconciliation_form_2stage.html')
+
+
+@app.route('/docs', methods=['GET'])
+def api_documentation():
+    """API documentation page."""
+    return _html_response(_DOCS_BODY, _DOCS_GZ)
 
 
 @app.route('/health', methods=['GET'])
@@ -227,7 +307,110 @@ def health():
 @app.route('/form', methods=['GET'])
 def reconciliation_form():
     """Serve the simple clinical reconciliation form."""
-    return render_template('reconciliation_form.html')
+    return _render_static('reconciliation_form.html')
+
+
+class ReconcileRequest(BaseModel):
+    """Body of a /reconcile request."""
+    
+    mode: Literal["simple", "comprehensive"] = "simple"
+    baseline_meds: List[str] = []
+    reference_meds: List[str] = []
+    baseline_label: str = "Current (Now)"
+    reference_label: str = "Previous (Then)"
+    patient_context: Optional[Dict] = None
+    no_cache: bool = False
+
+
+class ClinicalRequest(BaseModel):
+    """Body of a /reconcile_clinical request."""
+    
+    prior_text: str = ""
+    current_text: str = ""
+    patient_id: Optional[str] = None
+    encounter_id: Optional[str] = None
+    prior_text_source: str = "Prior Medication List"
+    current_text_source: str = "Current Clinical Note"
+    output_format: Literal["markdown", "json"] = "markdown"
+    no_cache: bool = False
+
+
+def _parse_body(model):
+    """
+    Parse and validate the raw request body in one pass.
+    
+    Args:
+        model: Request model class
+    
+    Returns:
+        (request model, None) on success, or (None, 400 response) on failure
+    """
+    raw = request.get_data()
+    if not raw:
+        return None, (jsonify({"error": "No JSON data provided"}), 400)
+    try:
+        return model.model_validate_json(raw), None
+    except ValidationError as e:
+        return None, (jsonify({
+            "error": "Invalid request",
+            "details": e.errors(include_url=False, include_context=False, include_input=False)
+        }), 400)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize a response payload with orjson."""
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+
+def _json_response(body: bytes):
+    """Wrap a pre-serialized JSON body in a response."""
+    return app.response_class(body, mimetype="application/json")
+
+
+@lru_cache(maxsize=config.RESPONSE_CACHE_SIZE)
+def _reconcile_cached(body: bytes) -> bytes:
+    """
+    Run reconciliation for a canonical (key-sorted) JSON request body.
+    
+    Memoized on the body string, so a repeated payload skips normalization,
+    the LLM call and response serialization. Failures raise and are not cached.
+    
+    Args:
+        body: Validated /reconcile request body as canonical (key-sorted) JSON
+    
+    Returns:
+        Serialized JSON response body
+    """
+    data = orjson.loads(body)
+    mode = data["mode"]
+    
+    reconciler = _get_reconciler()
+    
+    # Perform reconciliation
+    result = reconciler.reconcile(
+        baseline_meds=data["baseline_meds"],
+        reference_meds=data["reference_meds"],
+        mode=mode,
+        patient_context=data["patient_context"],
+        baseline_label=data["baseline_label"],
+        reference_label=data["reference_label"]
+    )
+    
+    # Format output
+    formatted_output = reconciler.format_output(result)
+    
+    return _dumps({
+        "success": True,
+        "mode": mode,
+        "reconciliation": {
+            "markdown": formatted_output,
+            "llm_output": result["llm_output"],
+            # SafetyIssue dataclasses serialize natively with orjson
+            "safety_issues": result["safety_issues"],
+            "ledger_validation": result["ledger_validation"],
+            "ledger_summary": result["ledger"].get_summary()
+        }
+    })
 
 
 @app.route('/reconcile', methods=['POST'])
@@ -242,74 +425,144 @@ def reconcile():
         "reference_meds": [...],
         "baseline_label": "...",
         "reference_label": "...",
-        "patient_context": {...}  // optional, for comprehensive mode
+        "patient_context": {...},  // optional, for comprehensive mode
+        "no_cache": true  // optional, bypass the response cache
     }
     """
-    try:
-        # Parse request
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
-        # Extract required fields
-        mode = data.get("mode", "simple")
-        baseline_meds = data.get("baseline_meds", [])
-        reference_meds = data.get("reference_meds", [])
-        baseline_label = data.get("baseline_label", "Current (Now)")
-        reference_label = data.get("reference_label", "Previous (Then)")
-        patient_context = data.get("patient_context")
-        
-        # Validate inputs
-        if not baseline_meds and not reference_meds:
-            return jsonify({
-                "error": "At least one medication list (baseline_meds or reference_meds) is required"
-            }), 400
-        
-        if mode not in ["simple", "comprehensive"]:
-            return jsonify({
-                "error": "Invalid mode. Must be 'simple' or 'comprehensive'"
-            }), 400
-        
-        # Perform reconciliation
-        result = reconciler.reconcile(
-            baseline_meds=baseline_meds,
-            reference_meds=reference_meds,
-            mode=mode,
-            patient_context=patient_context,
-            baseline_label=baseline_label,
-            reference_label=reference_label
-        )
-        
-        # Format output
-        formatted_output = reconciler.format_output(result)
-        
-        # Return response
-        return jsonify({
-            "success": True,
-            "mode": mode,
-            "reconciliation": {
-                "markdown": formatted_output,
-                "llm_output": result["llm_output"],
-                "safety_issues": [
-                    {
-                        "severity": issue.severity,
-                        "category": issue.category,
-                        "description": issue.description,
-                        "affected_meds": issue.affected_meds
-                    }
-                    for issue in result["safety_issues"]
-                ],
-                "ledger_validation": result["ledger_validation"],
-                "ledger_summary": result["ledger"].get_summary()
-            }
-        })
+    # Parse and validate request
+    req, error = _parse_body(ReconcileRequest)
+    if error:
+        return error
     
-    except Exception as e:
+    # Validate inputs
+    if not req.baseline_meds and not req.reference_meds:
         return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+            "error": "At least one medication list (baseline_meds or reference_meds) is required"
+        }), 400
+    
+    # Identical requests produce identical reconciliations; serve repeats from cache
+    body = orjson.dumps(req.model_dump(exclude={"no_cache"}), option=orjson.OPT_SORT_KEYS)
+    run = _reconcile_cached.__wrapped__ if req.no_cache else _reconcile_cached
+    return _json_response(_coalescer.run((run, body), run, body))
+
+
+# /reconcile_clinical response bodies, least recently used first. A plain
+# dict rather than lru_cache because streamed responses are only known once
+# the stream has finished.
+_clinical_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_clinical_cache_lock = threading.Lock()
+
+
+def _clinical_cache_get(key: tuple) -> Optional[bytes]:
+    """Return a cached /reconcile_clinical body, or None."""
+    with _clinical_cache_lock:
+        body = _clinical_cache.get(key)
+        if body is not None:
+            _clinical_cache.move_to_end(key)
+        return body
+
+
+def _clinical_cache_put(key: tuple, body: bytes) -> None:
+    """Store a /reconcile_clinical body, evicting the least recently used."""
+    with _clinical_cache_lock:
+        _clinical_cache[key] = body
+        _clinical_cache.move_to_end(key)
+        if len(_clinical_cache) > config.RESPONSE_CACHE_SIZE:
+            _clinical_cache.popitem(last=False)
+
+
+def _is_cacheable(reconciliation: Dict) -> bool:
+    """False for the stub the engine returns when it cannot parse the LLM reply."""
+    return "error" not in reconciliation["summary"]
+
+
+def _reconcile_clinical_json(
+    prior_text: str,
+    current_text: str,
+    patient_id: str,
+    encounter_id: str,
+    prior_text_source: str,
+    current_text_source: str
+) -> Tuple[bytes, bool]:
+    """
+    Run the 3-stage clinical pipeline and serialize the full JSON response.
+    
+    Returns:
+        (serialized JSON response body, whether it may be cached)
+    """
+    result = _get_pipeline().run_full_pipeline(
+        prior_text=prior_text,
+        current_text=current_text,
+        patient_id=patient_id,
+        encounter_id=encounter_id,
+        prior_text_source=prior_text_source,
+        current_text_source=current_text_source
+    )
+    
+    body = _dumps({
+        "success": True,
+        "pipeline": "clinical_nlp_3_stage",
+        "medication_list": result["medication_list"],
+        "reconciliation": result["reconciliation"],
+        "report_html": result["report_html"],
+        "metadata": result["pipeline_metadata"]
+    })
+    return body, _is_cacheable(result["reconciliation"])
+
+
+def _stream_clinical_report(args: tuple, cache_key: Optional[tuple]):
+    """
+    Stream the markdown/HTML report response as pipeline stages complete.
+    
+    The body is a single JSON object written incrementally, so the
+    medication list is sent before the LLM stage. The first stage runs
+    before the response is built, so extraction failures still reach the
+    500 handler. "success" is written last: a failure after the stream has
+    started cannot change the status code, so it ends the object with
+    "success": false and the error instead.
+    
+    Args:
+        args: Pipeline arguments (prior_text ... current_text_source)
+        cache_key: Key to store the finished body under, or None to skip caching
+            (results built from an unparseable LLM reply are never cached)
+    
+    Returns:
+        Streaming JSON response
+    """
+    stages = _get_pipeline().run_stages(*args)
+    # Raises before any headers are sent
+    first = next(stages)
+    
+    def generate():
+        chunks = [b'{"pipeline":"clinical_nlp_3_stage"']
+        cacheable = cache_key is not None
+        yield chunks[-1]
+        try:
+            for stage, data in chain((first,), stages):
+                if stage == "normalization":
+                    # Include medication list for Stage 1 display
+                    chunks.append(b',"medication_list":' + _dumps(data))
+                elif stage == "reconciliation":
+                    cacheable = cacheable and _is_cacheable(data)
+                    chunks.append(b',"summary":' + _dumps(data["summary"]))
+                else:
+                    chunks.append(
+                        b',"report_markdown":' + _dumps(data["report_markdown"])
+                        + b',"report_html":' + _dumps(data["report_html"])
+                        + b',"metadata":' + _dumps(data["pipeline_metadata"])
+                        + b',"success":true}'
+                    )
+                yield chunks[-1]
+        except Exception as e:
+            # The client only sees the trailer under a 200, so record it here
+            app.logger.exception("Clinical report stream failed")
+            yield b',"success":false,"error":' + _dumps(str(e)) + b'}'
+            return
+        
+        if cacheable:
+            _clinical_cache_put(cache_key, b"".join(chunks))
+    
+    return app.response_class(stream_with_context(generate()), mimetype="application/json")
 
 
 @app.route('/reconcile_clinical', methods=['POST'])
@@ -325,91 +578,86 @@ def reconcile_clinical():
         "encounter_id": "ENC-2025-10-19-001",  // optional
         "prior_text_source": "Home Medication List",  // optional
         "current_text_source": "Progress Note",  // optional
-        "output_format": "markdown" | "json"  // optional, default: markdown
+        "output_format": "markdown" | "json",  // optional, default: markdown
+        "no_cache": true  // optional, bypass the response cache
     }
     """
-    try:
-        # Parse request
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
-        # Extract required fields
-        prior_text = data.get("prior_text", "")
-        current_text = data.get("current_text", "")
-        
-        # Validate inputs
-        if not prior_text and not current_text:
-            return jsonify({
-                "error": "At least one text field (prior_text or current_text) is required"
-            }), 400
-        
-        # Extract optional fields
-        patient_id = data.get("patient_id")
-        encounter_id = data.get("encounter_id")
-        prior_text_source = data.get("prior_text_source", "Prior Medication List")
-        current_text_source = data.get("current_text_source", "Current Clinical Note")
-        output_format = data.get("output_format", "markdown")
-        
-        # Run the full 3-stage pipeline
-        result = clinical_pipeline.run_full_pipeline(
-            prior_text=prior_text,
-            current_text=current_text,
-            patient_id=patient_id,
-            encounter_id=encounter_id,
-            prior_text_source=prior_text_source,
-            current_text_source=current_text_source
-        )        # Format response based on output format
-        if output_format == "json":
-            return jsonify({
-                "success": True,
-                "pipeline": "clinical_nlp_3_stage",
-                "medication_list": result["medication_list"],
-                "reconciliation": result["reconciliation"],
-                "report_html": result["report_html"],
-                "metadata": result["pipeline_metadata"]
-            })
-        else:
-            # Return HTML report WITH medication list data for frontend display
-            return jsonify({
-                "success": True,
-                "pipeline": "clinical_nlp_3_stage",
-                "report_markdown": result["report_markdown"],
-                "report_html": result["report_html"],
-                "medication_list": result["medication_list"],  # Include medication list for Stage 1 display
-                "summary": result["reconciliation"]["summary"],
-                "metadata": result["pipeline_metadata"]
-            })
-    
-    except Exception as e:
-        import traceback
+    # Parse and validate request
+    req, error = _parse_body(ClinicalRequest)
+    if error:
+        return error
+    
+    # Validate inputs
+    if not req.prior_text and not req.current_text:
         return jsonify({
-            "success": False,
-            "error": str(e),
-            "traceback": traceback.format_exc()
-        }), 500
+            "error": "At least one text field (prior_text or current_text) is required"
+        }), 400
+    
+    args = (
+        req.prior_text,
+        req.current_text,
+        req.patient_id,
+        req.encounter_id,
+        req.prior_text_source,
+        req.current_text_source
+    )
+    
+    # Identical inputs produce identical reconciliations; serve repeats from cache
+    key = None if req.no_cache else args + (req.output_format,)
+    if key is not None:
+        body = _clinical_cache_get(key)
+        if body is not None:
+            return _json_response(body)
+    
+    if req.output_format != "json":
+        return _stream_clinical_report(args, key)
+    
+    if key is None:
+        return _json_response(_reconcile_clinical_json(*args)[0])
+    body, cacheable = _coalescer.run(key, _reconcile_clinical_json, *args)
+    if cacheable:
+        _clinical_cache_put(key, body)
+    return _json_response(body)
+
+
+# The 404 body never changes; serialize it once
+_NOT_FOUND_BODY = _dumps({
+    "error": "Endpoint not found",
+    "available_endpoints": ["/", "/docs", "/health", "/reconcile", "/reconcile_clinical", "/form"]
+})
 
 
 @app.errorhandler(404)
 def not_found(e):
     """Handle 404 errors."""
-    return jsonify({
-        "error": "Endpoint not found",
-        "available_endpoints": ["/", "/docs", "/health", "/reconcile", "/reconcile_clinical", "/form"]
-    }), 404
+    return _json_response(_NOT_FOUND_BODY), 404
+
+
+@app.errorhandler(Exception)
+def unhandled_exception(e):
+    """Turn uncaught view errors into a JSON 500 (traceback only in debug)."""
+    if isinstance(e, HTTPException):
+        return e
+    resp = {"success": False, "error": str(e)}
+    if app.debug:
+        import traceback
+        resp["traceback"] = traceback.format_exc()
+    return _json_response(_dumps(resp)), 500
 
 
 @app.errorhandler(500)
 def internal_error(e):
     """Handle 500 errors."""
-    return jsonify({
+    return _json_response(_dumps({
         "error": "Internal server error",
         "message": str(e)
-    }), 500
+    })), 500
 
 
 if __name__ == '__main__':
+    # Development server only. In production run:
+    #   gunicorn -c gunicorn_conf.py main:app
+    
     # Validate configuration
     try:
         config.validate_config()
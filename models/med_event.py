@@ -3,212 +3,237 @@ Medication Event Data Model
 Defines the structured schema for medication events extracted from clinical text.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from dataclasses import dataclass, field
+from pydantic import ConfigDict, Field, TypeAdapter, with_config
+from typing import Annotated, Optional, Literal
 from datetime import datetime
-import uuid
+import itertools
+import os
+import time
 
 
-class MedicationEvent(BaseModel):
+# med_id generator: a per-process prefix plus a counter instead of uuid4,
+# which reads os.urandom for every event. IDs only need to be unique within
+# a reconciliation; the prefix is reset after fork so workers never overlap.
+def _reset_med_ids() -> None:
+    global _MED_ID_PREFIX, _MED_ID_COUNTER
+    _MED_ID_PREFIX = f"{os.getpid():x}-{int(time.time()):x}-"
+    _MED_ID_COUNTER = itertools.count()
+
+
+def _next_med_id() -> str:
+    """Return a process-unique medication event ID."""
+    return f"{_MED_ID_PREFIX}{next(_MED_ID_COUNTER):012x}"
+
+
+_reset_med_ids()
+os.register_at_fork(after_in_child=_reset_med_ids)
+
+
+_EVENT_EXAMPLE = {
+    "list_source": "current",
+    "med_id": "a1b2c3d4-e5f6-7890-abcd-ef1234567890",
+    "drug_name_norm": "Metformin",
+    "drug_name_raw": "metformin",
+    "rxnorm_cui": "6809",
+    "dose_strength": 500.0,
+    "dose_unit": "mg",
+    "form": "tablet",
+    "frequency": "BID",
+    "route": "PO",
+    "is_negated": False,
+    "is_historical": False,
+    "is_family_history": False,
+    "is_uncertain": False,
+    "date_of_change_iso": "2025-10-01",
+    "temporal_expression": "started last month",
+    "raw_text_snippet": "Patient started metformin 500mg PO BID last month",
+    "sentence_context": "For diabetes management, patient started metformin 500mg PO BID last month.",
+    "extraction_confidence": 0.95,
+    "extraction_method": "medspacy",
+    "extracted_at": "2025-10-19T12:00:00Z"
+}
+
+
+@with_config(ConfigDict(json_schema_extra={"example": _EVENT_EXAMPLE}, revalidate_instances="always"))
+@dataclass(slots=True, kw_only=True)
+class MedicationEvent:
     """
     Structured representation of a single medication mention in clinical text.
     
     This schema represents the output of Stage 1 (Deterministic Extraction)
     and Stage 2 (Normalization) of the Med Rec pipeline.
+    
+    Thousands of these are created per document, so this is a slotted
+    dataclass rather than a Pydantic model: construction does no validation.
+    Validation and serialization happen once, at the API boundary, through
+    a TypeAdapter (see MedicationList.to_dict).
     """
     
     # Source and Identification
-    list_source: Literal["prior", "current"] = Field(
-        description="Which list this medication came from"
-    )
+    # Which list this medication came from
+    list_source: Literal["prior", "current"]
     
-    med_id: str = Field(
-        default_factory=lambda: str(uuid.uuid4()),
-        description="Unique identifier for this medication event"
-    )
+    # Unique identifier for this medication event
+    med_id: str = field(default_factory=_next_med_id)
     
     # Drug Information (Normalized)
-    drug_name_norm: str = Field(
-        description="Normalized drug name (RxNorm/UMLS concept)"
-    )
+    # Normalized drug name (RxNorm/UMLS concept)
+    drug_name_norm: str
     
-    drug_name_raw: Optional[str] = Field(
-        default=None,
-        description="Original drug name as found in text"
-    )
+    # Original drug name as found in text
+    drug_name_raw: Optional[str] = None
     
-    rxnorm_cui: Optional[str] = Field(
-        default=None,
-        description="RxNorm Concept Unique Identifier"
-    )
+    # RxNorm Concept Unique Identifier
+    rxnorm_cui: Optional[str] = None
     
     # Dosing Information
-    dose_strength: Optional[float] = Field(
-        default=None,
-        description="Numeric dose amount (e.g., 500.0)"
-    )
+    # Numeric dose amount (e.g., 500.0)
+    dose_strength: Optional[float] = None
     
-    dose_unit: Optional[str] = Field(
-        default=None,
-        description="Unit of measure (e.g., 'mg', 'mcg', 'units')"
-    )
+    # Unit of measure (e.g., 'mg', 'mcg', 'units')
+    dose_unit: Optional[str] = None
     
-    form: Optional[str] = Field(
-        default=None,
-        description="Drug form (e.g., 'tablet', 'capsule', 'injection')"
-    )
+    # Drug form (e.g., 'tablet', 'capsule', 'injection')
+    form: Optional[str] = None
     
     # Administration Details
-    frequency: Optional[str] = Field(
-        default=None,
-        description="Frequency of administration (e.g., 'BID', 'QHS', 'twice daily')"
-    )
+    # Frequency of administration (e.g., 'BID', 'QHS', 'twice daily')
+    frequency: Optional[str] = None
     
-    route: Optional[str] = Field(
-        default=None,
-        description="Route of administration (e.g., 'PO', 'IV', 'subcutaneous')"
-    )
+    # Route of administration (e.g., 'PO', 'IV', 'subcutaneous')
+    route: Optional[str] = None
     
     # Clinical Context Flags
-    is_negated: bool = Field(
-        default=False,
-        description="True if medication is explicitly denied or discontinued"
-    )
-    
-    is_historical: bool = Field(
-        default=False,
-        description="True if medication is mentioned as past/historical"
-    )
-    
-    is_family_history: bool = Field(
-        default=False,
-        description="True if medication is mentioned as family member's"
-    )
-    
-    is_uncertain: bool = Field(
-        default=False,
-        description="True if text contains uncertainty markers (might, maybe, considering)"
-    )
+    # True if medication is explicitly denied or discontinued
+    is_negated: bool = False
+    
+    # True if medication is mentioned as past/historical
+    is_historical: bool = False
+    
+    # True if medication is mentioned as family member's
+    is_family_history: bool = False
+    
+    # True if text contains uncertainty markers (might, maybe, considering)
+    is_uncertain: bool = False
     
     # Temporal Information
-    date_of_change_iso: Optional[str] = Field(
-        default=None,
-        description="ISO 8601 formatted date if temporal reference found (e.g., '2025-10-19')"
-    )
+    # ISO 8601 formatted date if temporal reference found (e.g., '2025-10-19')
+    date_of_change_iso: Optional[str] = None
     
-    temporal_expression: Optional[str] = Field(
-        default=None,
-        description="Original temporal expression (e.g., '3 weeks ago', 'since January')"
-    )
+    # Original temporal expression (e.g., '3 weeks ago', 'since January')
+    temporal_expression: Optional[str] = None
     
     # Source Text
-    raw_text_snippet: str = Field(
-        description="The sentence or phrase where the medication was extracted"
-    )
+    # The sentence or phrase where the medication was extracted
+    raw_text_snippet: str
     
-    sentence_context: Optional[str] = Field(
-        default=None,
-        description="Broader context (e.g., full paragraph) if available"
-    )
+    # Broader context (e.g., full paragraph) if available
+    sentence_context: Optional[str] = None
     
     # Extraction Metadata
-    extraction_confidence: Optional[float] = Field(
-        default=None,
-        ge=0.0,
-        le=1.0,
-        description="Confidence score from entity extraction (0.0 to 1.0)"
-    )
-    
-    extraction_method: Optional[str] = Field(
-        default="medspacy",
-        description="Method used for extraction (e.g., 'medspacy', 'quickumls')"
-    )
-    
-    extracted_at: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Timestamp when this event was extracted"
-    )
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "list_source": "current",
-                "med_id": "a1b2c3d4-e5f6-7890-abcd-ef1234567890",
-                "drug_name_norm": "Metformin",
-                "drug_name_raw": "metformin",
-                "rxnorm_cui": "6809",
-                "dose_strength": 500.0,
-                "dose_unit": "mg",
-                "form": "tablet",
-                "frequency": "BID",
-                "route": "PO",
-                "is_negated": False,
-                "is_historical": False,
-                "is_family_history": False,
-                "is_uncertain": False,
-                "date_of_change_iso": "2025-10-01",
-                "temporal_expression": "started last month",
-                "raw_text_snippet": "Patient started metformin 500mg PO BID last month",
-                "sentence_context": "For diabetes management, patient started metformin 500mg PO BID last month.",
-                "extraction_confidence": 0.95,
-                "extraction_method": "medspacy",
-                "extracted_at": "2025-10-19T12:00:00Z"
-            }
-        }
+    # Confidence score from entity extraction (0.0 to 1.0)
+    extraction_confidence: Annotated[Optional[float], Field(ge=0.0, le=1.0)] = None
+    
+    # Method used for extraction (e.g., 'medspacy', 'quickumls')
+    extraction_method: Optional[str] = "medspacy"
+    
+    # Timestamp when this event was extracted
+    extracted_at: datetime = field(default_factory=datetime.utcnow)
 
 
-class MedicationList(BaseModel):
+@with_config(ConfigDict(revalidate_instances="always"))
+@dataclass(kw_only=True)
+class MedicationList:
     """Collection of medication events for a single patient encounter."""
     
-    patient_id: Optional[str] = Field(
-        default=None,
-        description="Patient identifier (if available)"
-    )
-    
-    encounter_id: Optional[str] = Field(
-        default=None,
-        description="Encounter or visit identifier"
-    )
-    
-    reconciliation_date: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Date of reconciliation"
-    )
-    
-    medications: list[MedicationEvent] = Field(
-        default_factory=list,
-        description="List of all medication events"
-    )
-    
-    prior_text_source: Optional[str] = Field(
-        default=None,
-        description="Source of prior medication list (e.g., 'EHR', 'Patient Interview')"
-    )
+    # Patient identifier (if available)
+    patient_id: Optional[str] = None
+    
+    # Encounter or visit identifier
+    encounter_id: Optional[str] = None
+    
+    # Date of reconciliation
+    reconciliation_date: datetime = field(default_factory=datetime.utcnow)
+    
+    # List of all medication events
+    medications: list[MedicationEvent] = field(default_factory=list)
+    
+    # Source of prior medication list (e.g., 'EHR', 'Patient Interview')
+    prior_text_source: Optional[str] = None
+    
+    # Source of current medication notes (e.g., 'Progress Note', 'Discharge Summary')
+    current_text_source: Optional[str] = None
+    
+    @property
+    def _buckets(self) -> dict[str, list[MedicationEvent]]:
+        """
+        Partition medications into every getter's bucket in a single pass.
+        
+        The partition is reused until `medications` is replaced or changes
+        length, so appends after a getter call are picked up; call
+        invalidate() after editing events in place. Getters return copies.
+        """
+        meds = self.medications
+        cached = self.__dict__.get("_bucket_cache")
+        if cached is not None and cached[0] is meds and cached[1] == len(meds):
+            return cached[2]
+        
+        prior, current, active, discontinued, uncertain = [], [], [], [], []
+        for med in meds:
+            (prior if med.list_source == "prior" else current).append(med)
+            if med.is_negated:
+                discontinued.append(med)
+            elif not med.is_historical:
+                active.append(med)
+            if med.is_uncertain:
+                uncertain.append(med)
+        buckets = {
+            "prior": prior,
+            "current": current,
+            "active": active,
+            "discontinued": discontinued,
+            "uncertain": uncertain
+        }
+        self.__dict__["_bucket_cache"] = (meds, len(meds), buckets)
+        return buckets
     
-    current_text_source: Optional[str] = Field(
-        default=None,
-        description="Source of current medication notes (e.g., 'Progress Note', 'Discharge Summary')"
-    )
+    def invalidate(self) -> None:
+        """Drop the cached partition; call after editing events in `medications` in place."""
+        self.__dict__.pop("_bucket_cache", None)
     
     def get_prior_meds(self) -> list[MedicationEvent]:
         """Return only medications from the prior list."""
-        return [med for med in self.medications if med.list_source == "prior"]
+        return list(self._buckets["prior"])
     
     def get_current_meds(self) -> list[MedicationEvent]:
         """Return only medications from the current list."""
-        return [med for med in self.medications if med.list_source == "current"]
+        return list(self._buckets["current"])
     
     def get_active_meds(self) -> list[MedicationEvent]:
         """Return only active (not negated/historical) medications."""
-        return [
-            med for med in self.medications
-            if not med.is_negated and not med.is_historical
-        ]
+        return list(self._buckets["active"])
     
     def get_discontinued_meds(self) -> list[MedicationEvent]:
         """Return only discontinued/negated medications."""
-        return [med for med in self.medications if med.is_negated]
+        return list(self._buckets["discontinued"])
     
     def get_uncertain_meds(self) -> list[MedicationEvent]:
         """Return medications flagged as uncertain."""
-        return [med for med in self.medications if med.is_uncertain]
+        return list(self._buckets["uncertain"])
+    
+    def to_dict(self) -> dict:
+        """
+        Validate the list (and every event), then dump it to plain Python types.
+        
+        Returns:
+            Dictionary suitable for JSON serialization
+        
+        Raises:
+            pydantic.ValidationError: If any field violates the schema
+        """
+        return _LIST_ADAPTER.dump_python(_LIST_ADAPTER.validate_python(self))
+
+
+# Built once at import; events are only validated and serialized here, at the API boundary
+_LIST_ADAPTER = TypeAdapter(MedicationList)
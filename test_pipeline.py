@@ -181,6 +181,156 @@ def test_report_generation():
         return False
 
 
+def test_temporal_fallthrough():
+    """Test that a non-parsing match does not hide a later temporal expression."""
+    print("\n" + "=" * 80)
+    print("TEST 4: Temporal Fall-through")
+    print("=" * 80)
+    
+    from datetime import datetime
+    from core.temporal_parser import TemporalParser
+    
+    try:
+        parser = TemporalParser()
+        info = parser.extract_temporal_info(
+            "Patient started lisinopril 10 mg daily 3 weeks ago",
+            reference_date=datetime(2025, 3, 1)
+        )
+        
+        assert info["date_iso"] == "2025-02-08", info
+        assert info["temporal_type"] == "relative", info
+        print(f"\n✓ Parsed '{info['temporal_expression']}' -> {info['date_iso']}")
+        
+        # "stopped March 5" overlaps the full "March 5, 2024" date
+        text = "Lisinopril stopped March 5, 2024"
+        info = parser.extract_temporal_info(text, reference_date=datetime(2025, 3, 1))
+        assert info["date_iso"] == "2024-03-05", info
+        all_dates = parser.extract_all_dates(text, reference_date=datetime(2025, 3, 1))
+        assert "2024-03-05" in [d["date_iso"] for d in all_dates], all_dates
+        print(f"✓ Parsed '{info['temporal_expression']}' -> {info['date_iso']}")
+        
+        print("\n✓ Test 4 PASSED")
+        return True
+    
+    except Exception as e:
+        print(f"\n✗ Test 4 FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_malformed_json():
+    """Test that a malformed JSON body is rejected with a 400."""
+    print("\n" + "=" * 80)
+    print("TEST 5: Malformed JSON Body")
+    print("=" * 80)
+    
+    from main import app
+    
+    try:
+        client = app.test_client()
+        response = client.post("/reconcile", data=b"{bad", content_type="application/json")
+        
+        assert response.status_code == 400, response.status_code
+        assert response.get_json()["error"] == "Invalid request", response.get_json()
+        
+        print(f"\n✓ Malformed body rejected with {response.status_code}")
+        print("\n✓ Test 5 PASSED")
+        return True
+    
+    except Exception as e:
+        print(f"\n✗ Test 5 FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_safety_interactions():
+    """Test interaction checks against class members and salt/combination names."""
+    print("\n" + "=" * 80)
+    print("TEST 6: Safety Interaction Checks")
+    print("=" * 80)
+    
+    from core.normalizer import Medication
+    from tools.safety_checks import SafetyValidator
+    
+    def med(generic_name):
+        return Medication(raw_input=generic_name, name=generic_name, generic_name=generic_name)
+    
+    try:
+        validator = SafetyValidator()
+        
+        # "nsaid" in the interaction table matches its class members
+        issues = validator.check_interactions([med("warfarin"), med("ibuprofen")])
+        assert [i.affected_meds for i in issues] == [["warfarin", "nsaid"]], issues
+        assert issues[0].severity == "high", issues
+        print(f"\n✓ {issues[0].description}")
+        
+        # Salt and combination names match their component words
+        issues = validator.check_interactions([med("warfarin sodium"), med("naproxen/esomeprazole")])
+        assert [i.affected_meds for i in issues] == [["warfarin", "nsaid"]], issues
+        print(f"✓ {issues[0].description} (warfarin sodium + naproxen/esomeprazole)")
+        
+        # Unrelated drugs raise nothing
+        issues = validator.check_interactions([med("warfarin"), med("metformin")])
+        assert issues == [], issues
+        print("✓ No interaction for warfarin + metformin")
+        
+        print("\n✓ Test 6 PASSED")
+        return True
+    
+    except Exception as e:
+        print(f"\n✗ Test 6 FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_ledger_completeness():
+    """Test that ledger completeness counts a duplicated input medication twice."""
+    print("\n" + "=" * 80)
+    print("TEST 7: Ledger Completeness")
+    print("=" * 80)
+    
+    from core.normalizer import Medication
+    from tools.ledger import ReconciliationLedger
+    
+    def med(raw_input):
+        return Medication(raw_input=raw_input, name=raw_input, generic_name=raw_input.split()[0])
+    
+    try:
+        inputs = [med("lisinopril 10mg daily"), med("lisinopril 10mg daily"), med("metformin 500mg bid")]
+        
+        ledger = ReconciliationLedger()
+        ledger.add_entry(inputs[0], "Continued—No Change")
+        ledger.add_entry(inputs[2], "Continued—No Change")
+        ledger.add_entry(med("aspirin 81mg daily"), "New")
+        
+        result = ledger.validate_completeness(inputs)
+        assert not result["is_complete"], result
+        assert result["missing_count"] == 1, result
+        assert result["missing_medications"] == ["lisinopril 10mg daily"], result
+        assert result["extra_medications"] == ["aspirin 81mg daily"], result
+        print(f"\n✓ Missing: {result['missing_medications']}, extra: {result['extra_medications']}")
+        
+        ledger = ReconciliationLedger()
+        for input_med in inputs:
+            ledger.add_entry(input_med, "Continued—No Change")
+        result = ledger.validate_completeness(inputs)
+        assert result["is_complete"], result
+        assert "missing_medications" not in result and "extra_medications" not in result, result
+        print("✓ Complete once the duplicate has its own entry")
+        
+        print("\n✓ Test 7 PASSED")
+        return True
+    
+    except Exception as e:
+        print(f"\n✗ Test 7 FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 80)
@@ -190,7 +340,11 @@ def main():
     tests = [
         ("Clinical Extraction", test_clinical_extraction),
         ("Full Pipeline", test_full_pipeline),
-        ("Report Generation", test_report_generation)
+        ("Report Generation", test_report_generation),
+        ("Temporal Fall-through", test_temporal_fallthrough),
+        ("Malformed JSON Body", test_malformed_json),
+        ("Safety Interaction Checks", test_safety_interactions),
+        ("Ledger Completeness", test_ledger_completeness)
     ]
     
     results = []
@@ -5,12 +5,21 @@ Prevents silent drops and enforces reconciliation completeness.
 """
 
 from typing import List, Dict
+from collections import Counter
 from dataclasses import dataclass
 from core.normalizer import Medication
 import config
+import sys
 
 
-@dataclass
+# Status of entries that need clinician review
+_REVIEW_STATUS = sys.intern("Unmatched—Verify")
+
+# Zeroed per-status counts, copied into each new ledger
+_ZERO_SUMMARY_ITEMS = tuple((status, 0) for status in config.LEDGER_STATUSES)
+
+
+@dataclass(slots=True)
 class LedgerEntry:
     """Single entry in the reconciliation ledger."""
     input_medication: str
@@ -23,8 +32,30 @@ class ReconciliationLedger:
     """Manages the audit trail for medication reconciliation."""
     
     def __init__(self):
-        self.entries: List[LedgerEntry] = []
         self.valid_statuses = config.LEDGER_STATUSES
+        
+        # Canonical (interned) instance of each status; doubles as the
+        # validity check in add_entry
+        self._status_intern = {s: sys.intern(s) for s in self.valid_statuses}
+        
+        # Entries stored column-wise (one list per LedgerEntry field) so
+        # validation and formatting scan only the columns they need
+        self._inputs: List[str] = []
+        self._statuses: List[str] = []
+        self._outputs: List[str] = []
+        self._notes: List[str] = []
+        
+        # Maintained by add_entry so summaries and review lists need no rescan
+        self._summary: Dict[str, int] = dict(_ZERO_SUMMARY_ITEMS)
+        self._review_entries: List[LedgerEntry] = []
+    
+    @property
+    def entries(self) -> List[LedgerEntry]:
+        """Ledger entries as LedgerEntry objects (built on access)."""
+        return [
+            LedgerEntry(*row)
+            for row in zip(self._inputs, self._statuses, self._outputs, self._notes)
+        ]
     
     def add_entry(
         self,
@@ -42,18 +73,22 @@ class ReconciliationLedger:
             output_med: Output medication string (if changed/continued)
             notes: Additional notes or explanations
         """
-        if status not in self.valid_statuses:
+        canonical = self._status_intern.get(status)
+        if canonical is None:
             raise ValueError(
                 f"Invalid status '{status}'. Must be one of: {self.valid_statuses}"
             )
+        status = canonical
         
-        entry = LedgerEntry(
-            input_medication=input_med.raw_input,
-            reconciliation_status=status,
-            output_medication=output_med,
-            notes=notes
-        )
-        self.entries.append(entry)
+        if status == _REVIEW_STATUS:
+            self._review_entries.append(
+                LedgerEntry(input_med.raw_input, status, output_med, notes)
+            )
+        self._inputs.append(input_med.raw_input)
+        self._statuses.append(status)
+        self._outputs.append(output_med)
+        self._notes.append(notes)
+        self._summary[status] += 1
     
     def validate_completeness(
         self,
@@ -68,84 +103,84 @@ class ReconciliationLedger:
         Returns:
             Dictionary with validation results
         """
-        input_count = len(input_medications)
-        ledger_count = len(self.entries)
+        # Compare as multisets so a medication listed twice must appear twice
+        input_counts = Counter(med.raw_input for med in input_medications)
+        ledger_counts = Counter(self._inputs)
+        missing = input_counts - ledger_counts
+        extras = ledger_counts - input_counts
         
-        is_complete = input_count == ledger_count
+        is_complete = not missing and not extras
         
         result = {
             "is_complete": is_complete,
-            "input_count": input_count,
-            "ledger_count": ledger_count,
-            "missing_count": input_count - ledger_count if not is_complete else 0,
+            "input_count": len(input_medications),
+            "ledger_count": len(self._inputs),
+            "missing_count": sum(missing.values()),
         }
         
-        if not is_complete:
+        if missing:
             # Identify missing medications
-            input_raws = {med.raw_input for med in input_medications}
-            ledger_raws = {entry.input_medication for entry in self.entries}
-            missing = input_raws - ledger_raws
-            result["missing_medications"] = list(missing)
+            result["missing_medications"] = list(missing.elements())
+        if extras:
+            # Ledger entries that match no input medication
+            result["extra_medications"] = list(extras.elements())
         
         return result
     
     def get_summary(self) -> Dict[str, int]:
         """Get count summary by reconciliation status."""
-        summary = {status: 0 for status in self.valid_statuses}
-        
-        for entry in self.entries:
-            summary[entry.reconciliation_status] += 1
-        
-        return summary
+        return dict(self._summary)
     
     def format_as_table(self) -> str:
         """Format ledger as markdown table."""
-        if not self.entries:
+        if not self._inputs:
             return "**Ledger is empty.**"
         
-        table = "## Reconciliation Ledger\n\n"
-        table += "| # | Input Medication | Status | Output Medication | Notes |\n"
-        table += "|---|------------------|--------|-------------------|-------|\n"
+        lines = [
+            "## Reconciliation Ledger\n\n",
+            "| # | Input Medication | Status | Output Medication | Notes |\n",
+            "|---|------------------|--------|-------------------|-------|\n",
+        ]
         
-        for idx, entry in enumerate(self.entries, 1):
-            table += (
+        rows = zip(self._inputs, self._statuses, self._outputs, self._notes)
+        for idx, (input_med, status, output_med, notes) in enumerate(rows, 1):
+            lines.append(
                 f"| {idx} "
-                f"| {entry.input_medication} "
-                f"| {entry.reconciliation_status} "
-                f"| {entry.output_medication} "
-                f"| {entry.notes} |\n"
+                f"| {input_med} "
+                f"| {status} "
+                f"| {output_med} "
+                f"| {notes} |\n"
             )
         
         # Add summary
         summary = self.get_summary()
-        table += f"\n**Total Medications:** {len(self.entries)}\n\n"
+        lines.append(f"\n**Total Medications:** {len(self._inputs)}\n\n")
         
         for status, count in summary.items():
             if count > 0:
-                table += f"- {status}: {count}\n"
+                lines.append(f"- {status}: {count}\n")
         
-        return table
+        return "".join(lines)
     
     def format_summary_section(self) -> str:
         """Format a concise summary for the output."""
         summary = self.get_summary()
-        total = len(self.entries)
+        total = len(self._inputs)
         
-        output = "### Summary\n\n"
-        output += f"**Total Medications Reconciled:** {total}\n\n"
+        lines = [
+            "### Summary\n\n",
+            f"**Total Medications Reconciled:** {total}\n\n",
+        ]
         
         for status, count in summary.items():
             if count > 0:
-                output += f"- **{status}:** {count}\n"
+                lines.append(f"- **{status}:** {count}\n")
         
-        return output
+        return "".join(lines)
     
     def get_issues_for_review(self) -> List[LedgerEntry]:
         """Return entries that require human review."""
-        return [
-            entry for entry in self.entries
-            if entry.reconciliation_status == "Unmatched—Verify"
-        ]
+        return list(self._review_entries)
     
     def format_issues_section(self) -> str:
         """Format issues requiring review."""
@@ -154,12 +189,14 @@ class ReconciliationLedger:
         if not issues:
             return "### Issues to Review\n\n**None** - All medications successfully matched.\n"
         
-        output = "### Issues to Review\n\n"
-        output += "The following medications require clinician verification:\n\n"
+        lines = [
+            "### Issues to Review\n\n",
+            "The following medications require clinician verification:\n\n",
+        ]
         
         for idx, entry in enumerate(issues, 1):
-            output += f"{idx}. **{entry.input_medication}**\n"
+            lines.append(f"{idx}. **{entry.input_medication}**\n")
             if entry.notes:
-                output += f"   - {entry.notes}\n"
+                lines.append(f"   - {entry.notes}\n")
         
-        return output
+        return "".join(lines)
@@ -4,12 +4,81 @@ Implements deterministic validation: duplications, interactions, renal/hepatic c
 """
 
 from typing import List, Dict, Tuple, Optional
+from collections import Counter
 from dataclasses import dataclass
 from core.normalizer import Medication
 import config
+import re
 
 
-@dataclass
+_WORD_RE = re.compile(r"\w+")
+
+# Severity column text for the issues table
+_SEVERITY_PREFIX = {
+    "high": "🔴 High",
+    "moderate": "🟡 Moderate",
+    "low": "🟢 Low"
+}
+
+
+# ============================================================================
+# Lookup tables, built once from config at import
+# ============================================================================
+
+# Therapeutic class -> member drugs
+_THERAPEUTIC_SETS: Dict[str, frozenset] = {
+    class_name: frozenset(drugs)
+    for class_name, drugs in config.THERAPEUTIC_CLASSES.items()
+}
+
+
+def _drug_terms(drug: str) -> frozenset:
+    """Names that count as `drug` being present: itself plus class members."""
+    return frozenset({drug}) | _THERAPEUTIC_SETS.get(drug, frozenset())
+
+
+# (drug1, drug2, risk, names matching drug1, names matching drug2).
+# A class name (e.g. "nsaid") matches its members.
+_INTERACTIONS: Tuple[Tuple[str, str, str, frozenset, frozenset], ...] = tuple(
+    (
+        interaction["drug1"],
+        interaction["drug2"],
+        interaction["risk"],
+        _drug_terms(interaction["drug1"]),
+        _drug_terms(interaction["drug2"])
+    )
+    for interaction in config.HIGH_SEVERITY_INTERACTIONS
+)
+
+
+def _build_interaction_index() -> Dict[str, List[int]]:
+    """Map each drug name to the indexes of the _INTERACTIONS it can take part in."""
+    index: Dict[str, List[int]] = {}
+    for idx, (_, _, _, drug1_terms, drug2_terms) in enumerate(_INTERACTIONS):
+        for term in drug1_terms | drug2_terms:
+            index.setdefault(term, []).append(idx)
+    return index
+
+
+# Lets a check visit only interactions involving the medications present,
+# so its cost follows the medication list rather than the table size
+_INTERACTION_INDEX = _build_interaction_index()
+
+# Renal rules split into drug-specific rules and a drug -> (class, rule)
+# map for class rules, so each medication needs two dict lookups
+_RENAL_EXACT: Dict[str, Dict] = {
+    drug: contraindication
+    for drug, contraindication in config.RENAL_CONTRAINDICATIONS.items()
+    if drug not in config.THERAPEUTIC_CLASSES
+}
+_RENAL_CLASS: Dict[str, Tuple[str, Dict]] = {
+    drug: (class_name, contraindication)
+    for class_name, contraindication in config.RENAL_CONTRAINDICATIONS.items()
+    for drug in config.THERAPEUTIC_CLASSES.get(class_name, ())
+}
+
+
+@dataclass(slots=True)
 class SafetyIssue:
     """Represents a safety concern identified during validation."""
     severity: str  # "high", "moderate", "low"
@@ -18,13 +87,35 @@ class SafetyIssue:
     affected_meds: List[str]
 
 
+def _dedup_issues(issues: List[SafetyIssue]) -> List[SafetyIssue]:
+    """
+    Drop repeated issues, keeping the first of each.
+    
+    Issues are the same when they share category, severity and affected
+    medications (e.g. a drug listed twice hitting the same renal rule twice).
+    """
+    seen = set()
+    unique = []
+    for issue in issues:
+        key = (issue.category, issue.severity, tuple(sorted(issue.affected_meds)))
+        if key not in seen:
+            seen.add(key)
+            unique.append(issue)
+    return unique
+
+
 class SafetyValidator:
     """Performs deterministic safety checks on medication lists."""
     
     def __init__(self):
         self.therapeutic_classes = config.THERAPEUTIC_CLASSES
+        self.therapeutic_class_sets = _THERAPEUTIC_SETS
         self.renal_contraindications = config.RENAL_CONTRAINDICATIONS
+        self.renal_exact = _RENAL_EXACT
+        self.renal_class_map = _RENAL_CLASS
         self.interactions = config.HIGH_SEVERITY_INTERACTIONS
+        self.interaction_terms = _INTERACTIONS
+        self.interaction_index = _INTERACTION_INDEX
     
     def validate_all(
         self,
@@ -43,46 +134,48 @@ class SafetyValidator:
         """
         issues = []
         
-        # Check for therapeutic duplications
-        issues.extend(self.check_duplications(medications))
-        
-        # Check for high-severity interactions
-        issues.extend(self.check_interactions(medications))
+        # Duplications and interactions need at least two medications
+        if len(medications) > 1:
+            # Check for therapeutic duplications
+            issues.extend(self.check_duplications(medications))
+            
+            # Check for high-severity interactions
+            issues.extend(self.check_interactions(medications))
         
         # Check renal/hepatic contraindications if labs provided
         if labs:
             issues.extend(self.check_renal_contraindications(medications, labs))
         
-        return issues
+        return _dedup_issues(issues)
     
     def check_duplications(self, medications: List[Medication]) -> List[SafetyIssue]:
         """
         Check for therapeutic duplications (same class, different drugs).
         Also checks for exact duplicate (same drug multiple times).
         """
+        if len(medications) < 2:
+            return []
+        
         issues = []
         
-        # Exact duplicates (same generic name)
-        seen_generics = {}
-        for med in medications:
-            generic = med.generic_name
-            if generic in seen_generics:
+        # Exact duplicates (same generic name), one issue per drug
+        counts = Counter(med.generic_name for med in medications)
+        for generic, count in counts.items():
+            if count > 1:
                 issues.append(SafetyIssue(
                     severity="moderate",
                     category="duplication",
-                    description=f"Duplicate medication: {generic} appears multiple times",
+                    description=f"Duplicate medication: {generic} appears {count} times",
                     affected_meds=[generic]
                 ))
-            seen_generics[generic] = True
-        
-        # Therapeutic class duplications
-        for class_name, drug_list in self.therapeutic_classes.items():
-            found_drugs = [
-                med.generic_name for med in medications
-                if med.generic_name in drug_list
-            ]
-            
-            if len(found_drugs) > 1:
+        
+        # Therapeutic class duplications (distinct drugs, in list order)
+        unique_generics = list(counts)
+        generic_set = set(unique_generics)
+        for class_name, drug_set in self.therapeutic_class_sets.items():
+            hits = generic_set & drug_set
+            if len(hits) > 1:
+                found_drugs = [g for g in unique_generics if g in hits]
                 issues.append(SafetyIssue(
                     severity="moderate",
                     category="duplication",
@@ -94,24 +187,38 @@ class SafetyValidator:
     
     def check_interactions(self, medications: List[Medication]) -> List[SafetyIssue]:
         """Check for high-severity drug interactions."""
+        if len(medications) < 2:
+            return []
+        
         issues = []
-        med_names = [med.generic_name for med in medications]
         
-        for interaction in self.interactions:
-            drug1 = interaction["drug1"]
-            drug2 = interaction["drug2"]
+        # Full generic names plus their words, so "warfarin sodium" or
+        # "hydrocodone/acetaminophen" still match their components
+        med_terms = set()
+        for med in medications:
+            med_terms.add(med.generic_name)
+            med_terms.update(_WORD_RE.findall(med.generic_name))
+        
+        # Candidate interactions, in table order
+        candidates = sorted({
+            idx
+            for term in med_terms
+            for idx in self.interaction_index.get(term, ())
+        })
+        
+        for idx in candidates:
+            drug1, drug2, risk, drug1_terms, drug2_terms = self.interaction_terms[idx]
             
             # Check if both drugs present
-            drug1_present = any(drug1 in name for name in med_names)
-            drug2_present = any(drug2 in name for name in med_names)
+            if drug1_terms.isdisjoint(med_terms) or drug2_terms.isdisjoint(med_terms):
+                continue
             
-            if drug1_present and drug2_present:
-                issues.append(SafetyIssue(
-                    severity="high",
-                    category="interaction",
-                    description=f"{drug1.title()} + {drug2.title()}: {interaction['risk']}",
-                    affected_meds=[drug1, drug2]
-                ))
+            issues.append(SafetyIssue(
+                severity="high",
+                category="interaction",
+                description=f"{drug1.title()} + {drug2.title()}: {risk}",
+                affected_meds=[drug1, drug2]
+            ))
         
         return issues
     
@@ -130,42 +237,40 @@ class SafetyValidator:
         issues = []
         egfr = labs.get("egfr")
         
-        if egfr is None:
+        if egfr is None or not medications:
             return issues
         
         for med in medications:
             generic = med.generic_name
             
             # Check exact matches
-            if generic in self.renal_contraindications:
-                contraindication = self.renal_contraindications[generic]
-                if egfr < contraindication["egfr_threshold"]:
-                    issues.append(SafetyIssue(
-                        severity="high",
-                        category="renal",
-                        description=(
-                            f"{generic.title()} contraindicated with eGFR {egfr} "
-                            f"(threshold: {contraindication['egfr_threshold']}). "
-                            f"Reason: {contraindication['reason']}"
-                        ),
-                        affected_meds=[generic]
-                    ))
+            contraindication = self.renal_exact.get(generic)
+            if contraindication and egfr < contraindication["egfr_threshold"]:
+                issues.append(SafetyIssue(
+                    severity="high",
+                    category="renal",
+                    description=(
+                        f"{generic.title()} contraindicated with eGFR {egfr} "
+                        f"(threshold: {contraindication['egfr_threshold']}). "
+                        f"Reason: {contraindication['reason']}"
+                    ),
+                    affected_meds=[generic]
+                ))
             
             # Check class-based contraindications (e.g., "nsaid")
-            for contraindicated_class, contraindication in self.renal_contraindications.items():
-                if contraindicated_class in self.therapeutic_classes:
-                    class_drugs = self.therapeutic_classes[contraindicated_class]
-                    if generic in class_drugs and egfr < contraindication["egfr_threshold"]:
-                        issues.append(SafetyIssue(
-                            severity="high",
-                            category="renal",
-                            description=(
-                                f"{generic.title()} ({contraindicated_class.upper()}) "
-                                f"contraindicated with eGFR {egfr}. "
-                                f"Reason: {contraindication['reason']}"
-                            ),
-                            affected_meds=[generic]
-                        ))
+            class_hit = self.renal_class_map.get(generic)
+            if class_hit and egfr < class_hit[1]["egfr_threshold"]:
+                contraindicated_class, contraindication = class_hit
+                issues.append(SafetyIssue(
+                    severity="high",
+                    category="renal",
+                    description=(
+                        f"{generic.title()} ({contraindicated_class.upper()}) "
+                        f"contraindicated with eGFR {egfr}. "
+                        f"Reason: {contraindication['reason']}"
+                    ),
+                    affected_meds=[generic]
+                ))
         
         return issues
     
@@ -174,21 +279,19 @@ class SafetyValidator:
         if not issues:
             return "**No safety issues detected.**"
         
-        table = "| Severity | Category | Description | Medications |\n"
-        table += "|----------|----------|-------------|-------------|\n"
+        lines = [
+            "| Severity | Category | Description | Medications |\n",
+            "|----------|----------|-------------|-------------|\n",
+        ]
         
         for issue in issues:
-            severity_emoji = {
-                "high": "🔴",
-                "moderate": "🟡",
-                "low": "🟢"
-            }.get(issue.severity, "")
+            prefix = _SEVERITY_PREFIX.get(issue.severity) or f" {issue.severity.title()}"
             
-            table += (
-                f"| {severity_emoji} {issue.severity.title()} "
+            lines.append(
+                f"| {prefix} "
                 f"| {issue.category.title()} "
                 f"| {issue.description} "
                 f"| {', '.join(issue.affected_meds)} |\n"
             )
         
-        return table
+        return "".join(lines)